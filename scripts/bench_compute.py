@@ -0,0 +1,51 @@
+"""
+Misst compute_results für wachsende Projektanzahl und Planungshorizont.
+Die Zeit pro Projekt×Monat sollte in beiden Reihen etwa konstant bleiben (linear).
+Usage: PYTHONPATH=src python3 scripts/bench_compute.py   (FORECAST_NUMPY=0 für reines Python)
+"""
+
+from datetime import date
+import random
+import time
+
+from forecast.calendar import month_key
+from forecast.compute import compute_results
+from forecast.weights import assign_capacity_by_project_month
+
+
+def _months(n: int) -> list[str]:
+    return [month_key(date(2025 + i // 12, i % 12 + 1, 1)) for i in range(n)]
+
+
+def bench(n_projects: int, n_months: int, repeat: int = 3) -> float:
+    rnd = random.Random(n_projects * 1000 + n_months)
+    months = _months(n_months)
+    start = date(2025, 1, 1)
+    end = date(2025 + (n_months - 1) // 12, (n_months - 1) % 12 + 1, 28)
+    projects = []
+    counts = {}
+    for i in range(n_projects):
+        name = f"P{i:05d}"
+        projects.append({"name": name, "start": start, "end": end, "rest_budget_hours": rnd.uniform(10, 2000), "rate_eur_per_h": 100.0})
+        counts[name] = {mk: rnd.randint(15, 22) for mk in months}
+    capacity_by_month = {mk: 160.0 for mk in months}
+    projects_by_month = {mk: [p["name"] for p in projects] for mk in months}
+    assigned = assign_capacity_by_project_month(capacity_by_month, projects_by_month, {})
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        compute_results((start, end), projects, counts, assigned, 0.25)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    print(f"{'Projekte':>9} {'Monate':>7} {'Zeit (ms)':>10} {'µs/Projekt×Monat':>17}")
+    for n_projects, n_months in [(100, 12), (400, 12), (1600, 12), (400, 48), (400, 192)]:
+        t = bench(n_projects, n_months)
+        print(f"{n_projects:>9} {n_months:>7} {t * 1000:>10.1f} {t * 1e6 / (n_projects * n_months):>17.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
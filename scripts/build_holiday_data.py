@@ -0,0 +1,31 @@
+"""
+Erzeugt src/forecast/data/holidays_de.bin aus python-holidays.
+Usage: PYTHONPATH=src python3 scripts/build_holiday_data.py [FIRST_YEAR LAST_YEAR]
+"""
+
+import sys
+
+import holidays
+
+from forecast.holiday_data import DATA_PATH, STATES, encode
+
+
+def main(argv: list[str]) -> int:
+    first = int(argv[0]) if len(argv) > 0 else 2000
+    last = int(argv[1]) if len(argv) > 1 else 2100
+    by_state = {}
+    for s in STATES:
+        de = holidays.Germany(years=range(first, last + 1), subdiv=s)
+        per_year = {}
+        for d in de:
+            per_year.setdefault(d.year, []).append(d)
+        by_state[s] = per_year
+    blob = encode(first, last, by_state)
+    with open(DATA_PATH, "wb") as f:
+        f.write(blob)
+    print(f"{DATA_PATH}: {len(STATES)} Bundesländer, {first}–{last}, {len(blob)} Bytes (holidays {holidays.__version__})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -15,7 +15,7 @@ if ! command -v "$PY" >/dev/null 2>&1; then
   if command -v python >/dev/null 2>&1; then
     PY="python"
   else
-    echo "[smoke] Python not found. Install Python 3.11+ and deps (PyYAML, holidays, tabulate)." >&2
+    echo "[smoke] Python not found. Install Python 3.11+ and deps (PyYAML, tabulate)." >&2
     exit 1
   fi
 fi
@@ -35,24 +35,32 @@ PY
 # Quick check for runtime deps
 PYTHONPATH="${ROOT_DIR}/src${PYTHONPATH+:$PYTHONPATH}" $PY - <<'PY'
 try:
-    import yaml, holidays, tabulate  # type: ignore
-    print('[smoke] deps: PyYAML, holidays, tabulate: OK')
+    import yaml, tabulate  # type: ignore
+    print('[smoke] deps: PyYAML, tabulate: OK')
 except Exception as e:
     print('[smoke] deps missing:', e)
     print('        Tipp: make deps  (oder: make install)')
     raise SystemExit(1)
 PY
 
+OUT_DIR="$(mktemp -d)"
+trap 'rm -rf "$OUT_DIR"' EXIT
+
 echo "[smoke] Running CLI (module)..."
 set -o pipefail
-if ! PYTHONPATH="${ROOT_DIR}/src${PYTHONPATH+:$PYTHONPATH}" $PY -m forecast.cli --config "$CONFIG_PATH" --export csv | head -n 20; then
+if ! PYTHONPATH="${ROOT_DIR}/src${PYTHONPATH+:$PYTHONPATH}" $PY -m forecast.cli --config "$CONFIG_PATH" --outdir "$OUT_DIR" --export csv | head -n 20; then
   echo "[smoke] CLI run failed" >&2
   exit 1
 fi
+if ! ls "$OUT_DIR"/forecast_*_projects.csv "$OUT_DIR"/forecast_*_monthly.csv >/dev/null 2>&1; then
+  echo "[smoke] CSV export missing" >&2
+  exit 1
+fi
+echo "[smoke] CSV export: OK"
 
 if command -v forecast >/dev/null 2>&1; then
   echo "[smoke] Running CLI (entry point)..."
-  if ! forecast --config "$CONFIG_PATH" --export csv | head -n 10; then
+  if ! forecast --config "$CONFIG_PATH" --outdir "$OUT_DIR" --export csv | head -n 10; then
     echo "[smoke] Entry point run failed (this is optional)" >&2
   fi
 else
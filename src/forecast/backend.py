@@ -0,0 +1,21 @@
+"""
+Switch for the optional NumPy backend of capacity and result computation.
+Both backends give the same results; the pure-Python one is the fallback.
+"""
+
+from __future__ import annotations
+
+import os
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    np = None  # type: ignore
+
+# Set to "0" to force the pure-Python paths even if NumPy is installed
+NUMPY_ENV = "FORECAST_NUMPY"
+
+
+def use_numpy() -> bool:
+    """True if NumPy is installed and not disabled via FORECAST_NUMPY=0."""
+    return np is not None and os.environ.get(NUMPY_ENV, "1") != "0"
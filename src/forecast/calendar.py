@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+import json
+import os
 
-try:
-    import holidays  # type: ignore
-except Exception:  # pragma: no cover - optional dependency at runtime
-    holidays = None  # type: ignore
+from . import holiday_data
 
 WEEKDAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
 
@@ -30,33 +29,151 @@ def intersection(a: Tuple[date, date], b: Tuple[date, date]) -> Tuple[date, date
     return (s, e)
 
 
-def niedersachsen_holidays(years: Iterable[int]) -> Set[date]:
-    found: Set[date] = set()
+# Optional on-disk holiday cache (JSON) for years outside the bundled dataset;
+# set to a file path to enable.
+HOLIDAY_CACHE_ENV = "FORECAST_HOLIDAY_CACHE"
+
+# Process-wide memo: (state, year) -> holidays of that year (bundled data or `holidays`)
+_holiday_memo: Dict[Tuple[str, int], FrozenSet[date]] = {}
+_disk_cache_loaded = False
+
+
+def _import_holidays():
+    try:
+        import holidays  # type: ignore
+        return holidays
+    except Exception:  # pragma: no cover - optional dependency at runtime
+        return None
+
+
+def _cache_path() -> str | None:
+    return os.environ.get(HOLIDAY_CACHE_ENV) or None
+
+
+def _load_disk_cache() -> None:
+    global _disk_cache_loaded
+    if _disk_cache_loaded:
+        return
+    _disk_cache_loaded = True
+    path = _cache_path()
+    if not path or not os.path.exists(path):
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for state, years in data.items():
+            for y, days in years.items():
+                _holiday_memo.setdefault((state, int(y)), frozenset(date.fromisoformat(x) for x in days))
+    except Exception:
+        # Defekter Cache wird ignoriert und beim nächsten Schreiben ersetzt
+        pass
+
+
+def _save_disk_cache() -> None:
+    path = _cache_path()
+    if not path:
+        return
+    data: Dict[str, Dict[str, List[str]]] = {}
+    for (state, y), days in sorted(_holiday_memo.items()):
+        data.setdefault(state, {})[str(y)] = sorted(d.isoformat() for d in days)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _compute_holidays(state: str, years: List[int]) -> Dict[int, FrozenSet[date]] | None:
+    holidays = _import_holidays()
     if holidays is None:
-        # Fallback: keine automatische Berechnung, nur leer
-        return found
+        return None
     try:
         # Prefer subdiv (newer API), fallback to prov for older versions
         try:
-            de = holidays.Germany(years=list(years), subdiv="NI")  # type: ignore[attr-defined]
+            de = holidays.Germany(years=years, subdiv=state)  # type: ignore[attr-defined]
         except TypeError:
-            de = holidays.Germany(years=list(years), prov="NI")  # type: ignore
+            de = holidays.Germany(years=years, prov=state)  # type: ignore
+        by_year: Dict[int, Set[date]] = {y: set() for y in years}
         for d in de:
-            found.add(d)
-        return found
+            if d.year in by_year:
+                by_year[d.year].add(d)
+        return {y: frozenset(v) for y, v in by_year.items()}
     except Exception:
-        return found
+        return None
 
 
-def workdays_in_period(period: Tuple[date, date], state: str, holiday_overrides_add: List[date], holiday_overrides_remove: List[date], vacation_days: List[date]) -> List[date]:
-    start, end = period
-    years = set(range(start.year, end.year + 1))
-    hols: Set[date] = set()
-    if state.upper() == "NI":
-        hols = niedersachsen_holidays(years)
-    # Apply overrides
+def state_holidays(state: str, years: Iterable[int]) -> Set[date]:
+    """
+    Holidays of a German state for the given years. Years covered by the
+    bundled dataset are read from it; others fall back to `holidays`, computed
+    at most once per process and optionally persisted to disk.
+    """
+    state = state.upper()
+    years = sorted(set(years))
+    if state not in holiday_data.STATES:
+        return set()
+    missing = [y for y in years if (state, y) not in _holiday_memo]
+    if missing:
+        table = holiday_data.load_table()
+        if table is not None:
+            for y in missing:
+                if table.covers(state, y):
+                    _holiday_memo[(state, y)] = table.holidays(state, y)
+            missing = [y for y in missing if (state, y) not in _holiday_memo]
+    if missing:
+        _load_disk_cache()
+        missing = [y for y in missing if (state, y) not in _holiday_memo]
+    if missing:
+        computed = _compute_holidays(state, missing)
+        if computed is not None:
+            for y, days in computed.items():
+                _holiday_memo[(state, y)] = days
+            _save_disk_cache()
+    found: Set[date] = set()
+    for y in years:
+        found.update(_holiday_memo.get((state, y), ()))
+    return found
+
+
+def merge_intervals(intervals: Iterable[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Sort and merge overlapping or adjacent [start, end] date ranges."""
+    merged: List[Tuple[date, date]] = []
+    for s, e in sorted(intervals):
+        if merged and s <= merged[-1][1] + timedelta(days=1):
+            if e > merged[-1][1]:
+                merged[-1] = (merged[-1][0], e)
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def clip_intervals(intervals: List[Tuple[date, date]], start: date, end: date) -> List[Tuple[date, date]]:
+    """Cut sorted, merged ranges to [start, end]."""
+    res: List[Tuple[date, date]] = []
+    for s, e in intervals:
+        if e < start or s > end:
+            continue
+        res.append((max(s, start), min(e, end)))
+    return res
+
+
+def niedersachsen_holidays(years: Iterable[int]) -> Set[date]:
+    return state_holidays("NI", years)
+
+
+def _holidays_for(years: Iterable[int], state: str, holiday_overrides_add: List[date], holiday_overrides_remove: List[date]) -> Set[date]:
+    hols = state_holidays(state, years)
     hols.update(holiday_overrides_add)
     hols.difference_update(holiday_overrides_remove)
+    return hols
+
+
+def workdays_in_period(period: Tuple[date, date], state: str, holiday_overrides_add: List[date], holiday_overrides_remove: List[date], vacation_days: List[date]) -> List[date]:
+    start, end = period
+    hols = _holidays_for(range(start.year, end.year + 1), state, holiday_overrides_add, holiday_overrides_remove)
 
     vac = set(vacation_days)
 
@@ -70,3 +187,82 @@ def workdays_in_period(period: Tuple[date, date], state: str, holiday_overrides_
             continue
         res.append(d)
     return res
+
+
+class WorkCalendar:
+    """
+    Day index over a period with prefix sums for workdays and capacity.
+    Built once per run; counts between two dates are O(1) lookups.
+    """
+
+    def __init__(self, start: date, end: date, holidays: Set[date], vacations: List[Tuple[date, date]]):
+        self.start = start
+        self.end = end
+        self.holidays = holidays
+        n = (end - start).days + 1 if end >= start else 0
+        # Vacation ranges as a difference array, swept together with the day loop
+        vac_delta = [0] * (n + 1)
+        for s, e in clip_intervals(vacations, start, end):
+            vac_delta[(s - start).days] += 1
+            vac_delta[(e - start).days + 1] -= 1
+        in_vac = 0
+        self.workdays: List[date] = []
+        # _wd_prefix[i] = number of workdays in [start, start + i)
+        self._wd_prefix = [0] * (n + 1)
+        self._cap_prefix = [0.0] * (n + 1)
+        d = start
+        for i in range(n):
+            in_vac += vac_delta[i]
+            is_wd = d.weekday() < 5 and d not in holidays and not in_vac
+            if is_wd:
+                self.workdays.append(d)
+            self._wd_prefix[i + 1] = self._wd_prefix[i] + (1 if is_wd else 0)
+            d = d + timedelta(days=1)
+
+    @staticmethod
+    def build(period: Tuple[date, date], state: str, holiday_overrides_add: List[date], holiday_overrides_remove: List[date], vacations: List[Tuple[date, date]]) -> "WorkCalendar":
+        start, end = period
+        hols = _holidays_for(range(start.year, end.year + 1), state, holiday_overrides_add, holiday_overrides_remove)
+        return WorkCalendar(start, end, hols, vacations)
+
+    def _bounds(self, start: date, end: date) -> Tuple[int, int]:
+        """Clamp [start, end] to the calendar and return a half-open index range."""
+        s = max(0, (start - self.start).days)
+        e = min(len(self._wd_prefix) - 1, (end - self.start).days + 1)
+        return s, max(s, e)
+
+    def set_capacity(self, capacity_by_date: Dict[date, float]) -> None:
+        acc = 0.0
+        d = self.start
+        for i in range(len(self._cap_prefix) - 1):
+            acc += capacity_by_date.get(d, 0.0)
+            self._cap_prefix[i + 1] = acc
+            d = d + timedelta(days=1)
+
+    def count_workdays(self, start: date, end: date) -> int:
+        s, e = self._bounds(start, end)
+        return self._wd_prefix[e] - self._wd_prefix[s]
+
+    def capacity_between(self, start: date, end: date) -> float:
+        s, e = self._bounds(start, end)
+        return self._cap_prefix[e] - self._cap_prefix[s]
+
+    def workdays_between(self, start: date, end: date) -> List[date]:
+        s, e = self._bounds(start, end)
+        return self.workdays[self._wd_prefix[s]:self._wd_prefix[e]]
+
+    def workdays_by_month(self, start: date, end: date) -> Dict[str, int]:
+        """Workday count per month within [start, end]; O(months)."""
+        res: Dict[str, int] = {}
+        d = max(start, self.start)
+        last = min(end, self.end)
+        while d <= last:
+            if d.month == 12:
+                nxt = d.replace(year=d.year + 1, month=1, day=1)
+            else:
+                nxt = d.replace(month=d.month + 1, day=1)
+            n = self.count_workdays(d, min(last, nxt - timedelta(days=1)))
+            if n > 0:
+                res[month_key(d)] = n
+            d = nxt
+        return res
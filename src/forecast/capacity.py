@@ -1,13 +1,64 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, timedelta
+import heapq
 from typing import Dict, Iterable, List, Tuple
 
+from .backend import use_numpy
 from .calendar import month_key
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    np = None  # type: ignore
+
+# Capacity after sickness is rounded to whole micro-hours, and month totals are
+# accumulated in them; both backends round the same float with half-to-even
+MICRO = 1_000_000
+
 WEEKDAY_INDEX_TO_KEY = {0: "mon", 1: "tue", 2: "wed", 3: "thu", 4: "fri", 5: "sat", 6: "sun"}
 
 
+def override_segments(interval_overrides: List[Tuple[date, date, float]]) -> List[Tuple[date, date, float]]:
+    """
+    Resolve possibly overlapping overrides into sorted, disjoint segments.
+    On overlap the override listed last wins, as if applied in order.
+    """
+    # (position, is_start, index); an override covers [start, end + 1)
+    events = []
+    for idx, (s, e, hpd) in enumerate(interval_overrides):
+        if e < s:
+            continue
+        events.append((s.toordinal(), True, idx))
+        events.append((e.toordinal() + 1, False, idx))
+    events.sort()
+    segments: List[Tuple[date, date, float]] = []
+    active: List[int] = []  # max-heap of active override indices (negated)
+    ended = set()
+    i = 0
+    while i < len(events):
+        pos = events[i][0]
+        while i < len(events) and events[i][0] == pos:
+            _, is_start, idx = events[i]
+            if is_start:
+                heapq.heappush(active, -idx)
+            else:
+                ended.add(idx)
+            i += 1
+        while active and -active[0] in ended:
+            heapq.heappop(active)
+        if not active:
+            continue
+        # Active set is non-empty, so an end event follows
+        hpd = float(interval_overrides[-active[0]][2])
+        seg_s, seg_e = date.fromordinal(pos), date.fromordinal(events[i][0] - 1)
+        if segments and segments[-1][2] == hpd and segments[-1][1] + timedelta(days=1) == seg_s:
+            segments[-1] = (segments[-1][0], seg_e, hpd)
+        else:
+            segments.append((seg_s, seg_e, hpd))
+    return segments
+
+
 def compute_capacity_by_date(
     workdays: List[date],
     per_weekday: Dict[str, float],
@@ -19,29 +70,86 @@ def compute_capacity_by_date(
     for d in workdays:
         cap[d] = float(per_weekday.get(WEEKDAY_INDEX_TO_KEY[d.weekday()], 0.0))
 
-    # Apply interval overrides
-    for (s, e, hpd) in interval_overrides:
-        if e < s:
-            continue
-        dd = s
-        while dd <= e:
-            if dd in cap:
-                cap[dd] = float(hpd)
-            dd = dd.fromordinal(dd.toordinal() + 1)
+    # Apply interval overrides: one sweep over sorted workdays and segments
+    segments = override_segments(interval_overrides)
+    k = 0
+    for d in sorted(cap):
+        while k < len(segments) and segments[k][1] < d:
+            k += 1
+        if k == len(segments):
+            break
+        s, _, hpd = segments[k]
+        if s <= d:
+            cap[d] = float(hpd)
 
     # Apply sickness as expected fractional reduction
     if sick_prob_per_workday > 0:
         factor = max(0.0, 1.0 - sick_prob_per_workday)
         for d in list(cap.keys()):
-            cap[d] = round(cap[d] * factor, 6)
+            cap[d] = round(cap[d] * factor * MICRO) / MICRO
 
     return cap
 
 
 def aggregate_capacity_by_month(capacity_by_date: Dict[date, float]) -> Dict[str, float]:
-    res: Dict[str, float] = {}
+    # Summed in integer micro-hours: exact, order-independent and identical
+    # to the NumPy backend
+    res: Dict[str, int] = {}
     for d, h in capacity_by_date.items():
         mk = month_key(d)
-        res[mk] = res.get(mk, 0.0) + h
-    return res
+        res[mk] = res.get(mk, 0) + round(h * MICRO)
+    return {mk: v / MICRO for mk, v in res.items()}
+
+
+def compute_capacity_arrays(
+    workdays: List[date],
+    per_weekday: Dict[str, float],
+    interval_overrides: List[Tuple[date, date, float]],
+    sick_prob_per_workday: float,
+):
+    """
+    Vectorized variant of compute_capacity_by_date (requires NumPy).
+    Returns (days as datetime64[D], hours) for the sorted workdays.
+    """
+    days = np.array(sorted(workdays), dtype="datetime64[D]")
+    # 1970-01-01 was a Thursday → weekday index with Monday = 0
+    weekday = (days.astype("int64") + 3) % 7
+    weekday_hours = np.array([float(per_weekday.get(WEEKDAY_INDEX_TO_KEY[i], 0.0)) for i in range(7)])
+    hours = weekday_hours[weekday]
+
+    for s, e, hpd in override_segments(interval_overrides):
+        lo = np.searchsorted(days, np.datetime64(s, "D"), side="left")
+        hi = np.searchsorted(days, np.datetime64(e, "D"), side="right")
+        hours[lo:hi] = float(hpd)
+
+    if sick_prob_per_workday > 0:
+        factor = max(0.0, 1.0 - sick_prob_per_workday)
+        hours = np.rint(hours * factor * MICRO) / MICRO
+    return days, hours
+
 
+def aggregate_capacity_arrays_by_month(days, hours) -> Dict[str, float]:
+    if len(days) == 0:
+        return {}
+    months = days.astype("datetime64[M]")
+    starts = np.flatnonzero(np.concatenate(([True], months[1:] != months[:-1])))
+    totals = np.add.reduceat(np.rint(hours * MICRO).astype(np.int64), starts)
+    return {str(months[i]): int(t) / MICRO for i, t in zip(starts, totals)}
+
+
+def compute_capacity(
+    workdays: List[date],
+    per_weekday: Dict[str, float],
+    interval_overrides: List[Tuple[date, date, float]],
+    sick_prob_per_workday: float,
+) -> Tuple[Dict[date, float], Dict[str, float]]:
+    """
+    Capacity per date and per month. Uses the NumPy backend when available,
+    otherwise the pure-Python functions above.
+    """
+    if workdays and use_numpy():
+        days, hours = compute_capacity_arrays(workdays, per_weekday, interval_overrides, sick_prob_per_workday)
+        by_date = dict(zip(days.astype(object), hours.tolist()))
+        return by_date, aggregate_capacity_arrays_by_month(days, hours)
+    by_date = compute_capacity_by_date(workdays, per_weekday, interval_overrides, sick_prob_per_workday)
+    return by_date, aggregate_capacity_by_month(by_date)
@@ -0,0 +1,214 @@
+"""
+SVG charts for the HTML report. One <rect> per visible segment, colours
+via shared CSS classes (one rule per project, not per element). Beyond
+`max_series` projects, the smaller ones are merged into "Sonstige", and
+each chart stays within a size budget by showing fewer series.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .formatting import _html_escape, format_number_de
+
+# Projects shown individually before the rest is grouped into "Sonstige"
+CHART_MAX_SERIES = 15
+# Rows per month in the per-project chart before grouping
+CHART_MAX_ROWS = 25
+# Approximate upper bound for one chart's markup
+CHART_BUDGET_BYTES = 256 * 1024
+
+# Estimated bytes per segment (rect + tooltip + label) and per project row
+_SEG_BYTES = 200
+_ROW_BYTES = 520
+
+# Geometry in viewBox units (the SVG scales to the page width)
+_W = 1000
+_LABEL_W = 150
+_VALUE_W = 150
+_BAR_X = _LABEL_W
+_BAR_W = _W - _LABEL_W - _VALUE_W - 10
+_ROW_H = 18
+_ROW_GAP = 6
+# Segments narrower than this share of the bar get no inline label
+_LABEL_MIN_SHARE = 0.12
+
+OTHER_LABEL = "Sonstige"
+
+
+def project_hue(index: int) -> int:
+    return (index * 67) % 360
+
+
+def _style(indices: Sequence[int], available: bool = False) -> str:
+    # Same rule per project in every chart, so repeated definitions agree
+    rules = [f".chart .p{i}{{fill:hsl({project_hue(i)},65%,55%);background:hsl({project_hue(i)},65%,55%)}}" for i in indices]
+    if available:
+        rules += [f".chart .a{i}{{fill:hsl({project_hue(i)},45%,85%)}}" for i in indices]
+    return "<style>" + "".join(rules) + "</style>"
+
+
+def _num(x: float) -> str:
+    return f"{x:.2f}".rstrip("0").rstrip(".")
+
+
+def _pct(part: float, total: float) -> float:
+    return (part / total * 100.0) if total > 0 else 0.0
+
+
+def _other_label(count: int) -> str:
+    return f"{OTHER_LABEL} ({count} {'Projekt' if count == 1 else 'Projekte'})"
+
+
+def _svg_open(rows: int) -> str:
+    height = rows * (_ROW_H + _ROW_GAP) + _ROW_GAP
+    return f'<svg class="fc" viewBox="0 0 {_W} {height}" width="100%" preserveAspectRatio="xMinYMin meet" role="img">'
+
+
+def _row_y(row: int) -> float:
+    return _ROW_GAP + row * (_ROW_H + _ROW_GAP)
+
+
+def _text(x: float, y: float, text: str, cls: str = "", anchor: str = "") -> str:
+    attrs = f' class="{cls}"' if cls else ""
+    if anchor:
+        attrs += f' text-anchor="{anchor}"'
+    return f'<text x="{_num(x)}" y="{_num(y + _ROW_H * 0.72)}"{attrs}>{text}</text>'
+
+
+def _segment(x: float, y: float, width: float, cls: str, tooltip: str, label: Optional[str], label_cls: str) -> str:
+    out = f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(width)}" height="{_ROW_H}" class="{cls}"><title>{tooltip}</title></rect>'
+    if label:
+        out += _text(x + width / 2, y, label, label_cls, "middle")
+    return out
+
+
+def _limit(wanted: int, per_month_extra: int, months: int, unit_bytes: int, budget: int) -> int:
+    """Largest series count <= `wanted` whose estimated markup fits `budget`."""
+    if months == 0:
+        return wanted
+    fit = budget // (unit_bytes * months) - per_month_extra
+    return max(1, min(wanted, fit))
+
+
+def month_stack_chart(
+    months: List[str],
+    totals: List[float],
+    series: List[Tuple[int, str, List[float]]],
+    max_series: int = CHART_MAX_SERIES,
+    budget_bytes: int = CHART_BUDGET_BYTES,
+) -> Iterator[str]:
+    """
+    Stacked bar per month: used hours per project (`series`: colour index,
+    name, value per month) and the unused rest of `totals`. Projects beyond
+    the largest `max_series` (by total) form one "Sonstige" segment.
+    """
+    ranked = sorted(series, key=lambda s: -sum(s[2]))
+    n = _limit(min(max_series, len(ranked)), 2, len(months), _SEG_BYTES, budget_bytes)
+    shown_set = {s[0] for s in ranked[:n]}
+    shown = [s for s in series if s[0] in shown_set]
+    grouped = [s for s in series if s[0] not in shown_set]
+    other = [sum(s[2][j] for s in grouped) for j in range(len(months))] if grouped else None
+
+    legend = [f'<span class="swatch p{i}"></span>{_html_escape(name)}' for i, name, _ in shown]
+    if grouped:
+        legend.append(f'<span class="swatch other"></span>{_other_label(len(grouped))}')
+    legend.append('<span class="swatch rest"></span>Rest')
+    yield '<div class="chart">'
+    yield '<div class="legend">' + " &nbsp; ".join(legend) + "</div>"
+    yield _svg_open(len(months)) + _style([i for i, _, _ in shown])
+
+    for j, mk in enumerate(months):
+        total = float(totals[j])
+        y = _row_y(j)
+        parts = [_text(0, y, _html_escape(mk))]
+        x = float(_BAR_X)
+        used_sum = 0.0
+        segs: List[Tuple[str, str, float, str]] = [(f"p{i}", _html_escape(name), values[j], "in") for i, name, values in shown]
+        if other is not None:
+            segs.append(("other", _other_label(len(grouped)), other[j], "in"))
+        for cls, label, u, label_cls in segs:
+            u = float(u)
+            used_sum += u
+            if u <= 0 or total <= 0:
+                continue
+            width = _BAR_W * u / total
+            pct = _pct(u, total)
+            text = f"{format_number_de(u, 2)} h ({pct:.1f}%)"
+            inline = text if u / total >= _LABEL_MIN_SHARE else None
+            parts.append(_segment(x, y, width, cls, f"{label}: {text}", inline, label_cls))
+            x += width
+        rest = max(0.0, total - used_sum)
+        if rest > 0 and total > 0:
+            text = f"{format_number_de(rest, 2)} h ({_pct(rest, total):.1f}%)"
+            inline = text if rest / total >= _LABEL_MIN_SHARE else None
+            parts.append(_segment(x, y, _BAR_W * rest / total, "rest", f"Rest: {text}", inline, "in-dark"))
+        parts.append(_text(_W, y, f"{format_number_de(total, 2)} h", anchor="end"))
+        yield "".join(parts)
+    yield "</svg></div>"
+
+
+def project_month_chart(
+    months: List[str],
+    rows_by_month: List[List[Tuple[int, str, float, float]]],
+    max_rows: int = CHART_MAX_ROWS,
+    budget_bytes: int = CHART_BUDGET_BYTES,
+) -> Iterator[str]:
+    """
+    Per month one bar per active project (`rows_by_month[j]`: colour index,
+    name, budget available at month start, used): used part and what
+    remains. Projects beyond the `max_rows` with the most available budget
+    are summed into one "Sonstige" row per month.
+    """
+    limit = _limit(max_rows, 2, len(months), _ROW_BYTES, budget_bytes)
+    plan: List[Tuple[List[Tuple[int, str, float, float]], Optional[Tuple[int, float, float]]]] = []
+    indices: Dict[int, None] = {}
+    n_rows = 0
+    for rows in rows_by_month:
+        if len(rows) > limit:
+            keep = {r[0] for r in sorted(rows, key=lambda r: -r[2])[:limit]}
+            shown = [r for r in rows if r[0] in keep]
+            rest = [r for r in rows if r[0] not in keep]
+            other = (len(rest), sum(r[2] for r in rest), sum(r[3] for r in rest))
+        else:
+            shown, other = rows, None
+        plan.append((shown, other))
+        for r in shown:
+            indices[r[0]] = None
+        n_rows += 1 + len(shown) + (1 if other else 0)
+
+    yield '<div class="chart">'
+    yield _svg_open(n_rows) + _style(list(indices), available=True)
+    row = 0
+    for mk, (shown, other) in zip(months, plan):
+        yield _text(0, _row_y(row), _html_escape(mk), "hd")
+        row += 1
+        max_avail = max((r[2] for r in shown), default=0.0)
+        if max_avail <= 0:
+            max_avail = 1.0
+        entries = [(f"p{i}", f"a{i}", _html_escape(name), avail, used) for i, name, avail, used in shown]
+        if other:
+            count, avail, used = other
+            entries.append(("other", "other-a", _other_label(count), avail, used))
+        for used_cls, avail_cls, label, avail_total, used in entries:
+            y = _row_y(row)
+            row += 1
+            avail_after = max(0.0, avail_total - used)
+            # The grouped row may exceed the scale of single projects: clip to the bar
+            total_w = min(1.0, max(0.0, avail_total / max_avail))
+            used_w = min(total_w, max(0.0, used / max_avail))
+            used_pct = _pct(used, avail_total)
+            avail_pct = _pct(avail_after, avail_total)
+            parts = [_text(0, y, label)]
+            used_text = f"{format_number_de(used, 2)} h ({used_pct:.1f}%)"
+            avail_text = f"{format_number_de(avail_after, 2)} h ({avail_pct:.1f}%)"
+            if used_w > 0:
+                parts.append(_segment(_BAR_X, y, _BAR_W * used_w, used_cls, f"{label} genutzt: {used_text}",
+                                      used_text if used_w >= _LABEL_MIN_SHARE else None, "in"))
+            if total_w - used_w > 0:
+                parts.append(_segment(_BAR_X + _BAR_W * used_w, y, _BAR_W * (total_w - used_w), avail_cls,
+                                      f"{label} verfügbar: {avail_text}",
+                                      avail_text if total_w - used_w >= _LABEL_MIN_SHARE else None, "in-dark"))
+            parts.append(_text(_W, y, f"{format_number_de(used, 2)} / {format_number_de(avail_total, 2)} h", anchor="end"))
+            yield "".join(parts)
+    yield "</svg></div>"
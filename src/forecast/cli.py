@@ -7,29 +7,29 @@ from typing import Dict, List, Tuple
 import sys
 
 from .config import load_config, Config
-from .calendar import intersection, workdays_in_period, month_key
-from .capacity import compute_capacity_by_date, aggregate_capacity_by_month
-from .weights import assign_capacity_by_project_month
-from .compute import compute_results
-from .formatting import (
-    render_table,
-    export_html_page,
-    format_number_de,
-    format_currency_eur,
-)
-from .calendar import niedersachsen_holidays
-
-
-def _collect_interval_overrides(capacity_cfg) -> List[Tuple[date, date, float]]:
-    res = []
-    for o in capacity_cfg.interval_overrides:
-        res.append((o.start, o.end, o.hours_per_day))
-    return res
+from .engine import build_plan, update_plan
+from .formatting import render_table, render_rows
+from .report import simulation_table
+
+
+def _open_output(dest: str, compress_level: int | None = None):
+    """Text file for writing; gzip-compressed while writing if `dest` ends with .gz."""
+    if dest.endswith(".gz"):
+        import gzip
+        import io
+        from .compress import level_for
+        # mtime=0: identical reports give identical files
+        return io.TextIOWrapper(gzip.GzipFile(dest, "wb", compresslevel=level_for("gzip", compress_level), mtime=0), encoding="utf-8")
+    return open(dest, "w", encoding="utf-8")
 
 
 def run(config_path: str | None = None, output_path: str | None = None,
         as_of: str | None = None, planning_start: str | None = None, planning_end: str | None = None,
-        round_hours: float | None = None, outdir: str | None = None) -> int:
+        round_hours: float | None = None, outdir: str | None = None,
+        simulate: int | None = None, seed: int | None = None, workers: int | None = None,
+        gzip_output: bool = False, compress_level: int | None = None,
+        watch_state: dict | None = None, fmt: str = "html", tables: str = "static",
+        export: list[str] | None = None, csv_de: bool = False) -> int:
     import os
     # Determine config path
     cfg_path = config_path
@@ -44,6 +44,18 @@ def run(config_path: str | None = None, output_path: str | None = None,
 
     if round_hours is not None:
         cfg.settings.round_hours = float(round_hours)
+    if simulate is not None:
+        cfg.simulation.runs = int(simulate)
+    if seed is not None:
+        cfg.simulation.seed = int(seed)
+    if workers is not None:
+        cfg.simulation.workers = int(workers)
+    cfg.simulation.validate()
+    if export:
+        # Missing optional dependencies fail before anything is computed or written
+        from .export import EXPORTERS
+        for export_fmt in export:
+            EXPORTERS[export_fmt].check()
 
     if planning_start or planning_end:
         start = cfg.settings.planning_period.start if not planning_start else date.fromisoformat(planning_start)
@@ -61,103 +73,20 @@ def run(config_path: str | None = None, output_path: str | None = None,
         if eff_as_of > cfg.settings.planning_period.start:
             cfg.settings.planning_period.start = eff_as_of
 
-    planning_period = (cfg.settings.planning_period.start, cfg.settings.planning_period.end)
-
-    # Workdays for overall planning period
-    all_workdays = workdays_in_period(
-        planning_period,
-        cfg.settings.state,
-        cfg.calendar.holiday_overrides_add,
-        cfg.calendar.holiday_overrides_remove,
-        cfg.calendar.vacation_days,
-    )
-
-    # Capacity per date (after sickness reduction)
-    capacity_by_date = compute_capacity_by_date(
-        workdays=all_workdays,
-        per_weekday=cfg.capacity.per_weekday,
-        interval_overrides=_collect_interval_overrides(cfg.capacity),
-        sick_prob_per_workday=cfg.sickness.prob_per_workday,
-    )
-    capacity_by_month = aggregate_capacity_by_month(capacity_by_date)
-
-    # Determine active projects per month within planning cut
-    projects: List[dict] = []
-    projects_by_month: Dict[str, List[str]] = {}
-    explicit_weights: Dict[str, Dict[str, float]] = {}
-    explicit_limits: Dict[str, Dict[str, float]] = {}
-    workdays_by_project: Dict[str, List[date]] = {}
-
-    ignored_projects: List[str] = []
-    ignored_reasons: Dict[str, str] = {}
-
-    for p in cfg.projects:
-        cut = intersection(planning_period, (p.start, p.end))
-        if cut is None:
-            continue
-        # Workdays per project (within its cut)
-        wdays = workdays_in_period(cut, cfg.settings.state, cfg.calendar.holiday_overrides_add, cfg.calendar.holiday_overrides_remove, cfg.calendar.vacation_days)
-        if len(wdays) == 0:
-            ignored_projects.append(p.name)
-            ignored_reasons[p.name] = "Keine verbleibenden Arbeitstage im Planungsschnitt"
-            continue
-
-        projects.append({
-            "name": p.name,
-            "start": cut[0],
-            "end": cut[1],
-            "rest_budget_hours": p.rest_budget_hours,
-            "rate_eur_per_h": p.rate_eur_per_h,
-            "weights_by_month": dict(p.weights_by_month),
-        })
-        # Active months
-        months = set()
-        d = cut[0]
-        while d <= cut[1]:
-            mk = month_key(d)
-            months.add(mk)
-            # next month first day
-            if d.month == 12:
-                d = d.replace(year=d.year + 1, month=1, day=1)
-            else:
-                d = d.replace(month=d.month + 1, day=1)
-        for m in months:
-            projects_by_month.setdefault(m, []).append(p.name)
-        explicit_weights[p.name] = dict(p.weights_by_month)
-        explicit_limits[p.name] = dict(getattr(p, 'limits_by_month', {}) or {})
-
-        workdays_by_project[p.name] = wdays
-
-    assigned = assign_capacity_by_project_month(capacity_by_month, projects_by_month, explicit_weights)
-
-    results = compute_results(
-        planning_period=planning_period,
-        projects=projects,
-        workdays_by_project=workdays_by_project,
-        assigned_capacity_by_project_month=assigned,
-        round_hours=cfg.settings.round_hours,
-    )
-
-    # Format output rows
-    # Prepare monthly day breakdown keys
-    # Collect all month keys present in any project's workdays
-    all_months: List[str] = []
-    months_set = set()
-    for pname, days in workdays_by_project.items():
-        for d in days:
-            mk = month_key(d)
-            if mk not in months_set:
-                months_set.add(mk)
-                all_months.append(mk)
-    all_months.sort()
+    # Watch mode: recompute incrementally from the previous run's plan
+    if watch_state:
+        plan = update_plan(watch_state["cfg"], watch_state["plan"], cfg)
+    else:
+        plan = build_plan(cfg)
+    if watch_state is not None:
+        watch_state.update(cfg=cfg, plan=plan)
+    results = plan.results
+    workday_counts_by_project = plan.workday_counts_by_project
+    all_months = plan.months
 
     rows = []
     for r in results:
-        # month day counts for this project
-        month_counts: Dict[str, int] = {}
-        for d in workdays_by_project.get(r.name, []):
-            mk = month_key(d)
-            month_counts[mk] = month_counts.get(mk, 0) + 1
+        month_counts = workday_counts_by_project.get(r.name, {})
         rows.append({
             "Projekt": r.name,
             "Zeitraum": f"{r.period_start}–{r.period_end}",
@@ -205,8 +134,11 @@ def run(config_path: str | None = None, output_path: str | None = None,
         total_row[key] = sum(r.get(key, 0) for r in rows)
     rows_with_total = rows + [total_row]
 
+    # Report or plan on stdout: keep stdout machine-readable, human output goes to stderr
+    out = sys.stderr if output_path == "-" else sys.stdout
+
     # Print table
-    print(render_table(rows_with_total))
+    print(render_table(rows_with_total), file=out)
 
     # Export: write an HTML with timestamp into outdir (default: ./output)
     from datetime import datetime
@@ -217,13 +149,43 @@ def run(config_path: str | None = None, output_path: str | None = None,
     os.makedirs(od, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    # Use shared report generator for HTML
-    from .report import create_html_report
-    html = create_html_report(cfg)
-    dest = output_path or os.path.join(od, f"forecast_{ts}.html")
-    with open(dest, "w", encoding="utf-8") as f:
-        f.write(html)
-    print(f"\nGespeichert: {dest}")
+    if fmt == "json":
+        # Plan as JSON, written project by project
+        from .export import iter_plan_json
+        chunks = iter_plan_json(plan)
+    else:
+        # Shared report generator, streamed: rows are formatted while the file is written
+        from .report import iter_html_report
+        chunks = iter_html_report(cfg, plan, virtual_tables=tables == "virtual")
+    ext = "json" if fmt == "json" else "html"
+    dest = output_path or os.path.join(od, f"forecast_{ts}.{ext}" + (".gz" if gzip_output else ""))
+    if dest == "-":
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    else:
+        with _open_output(dest, compress_level) as f:
+            for chunk in chunks:
+                f.write(chunk)
+    if dest != "-":
+        print(f"\nGespeichert: {dest}", file=out)
+
+    if export:
+        # Flat tables next to the report: <name>_projects.<ext>, <name>_monthly.<ext>
+        from .export import write_exports
+        if dest == "-":
+            base = os.path.join(od, f"forecast_{ts}")
+        else:
+            base = os.path.splitext(dest[:-3] if dest.endswith(".gz") else dest)[0]
+        for export_fmt in dict.fromkeys(export):
+            for path in write_exports(plan, export_fmt, base, decimal_comma=csv_de):
+                print(f"Gespeichert: {path}", file=out)
+
+    if plan.simulation is not None and plan.simulation.projects:
+        sim_headers, sim_rows = simulation_table(plan.simulation)
+        print(f"\nSimulation Krankheit ({plan.simulation.runs} Läufe, Seed {plan.simulation.seed}):", file=out)
+        print(render_rows([h[0] for h in sim_headers], sim_rows), file=out)
 
     # Print warnings if any
     util_warnings = []
@@ -237,29 +199,71 @@ def run(config_path: str | None = None, output_path: str | None = None,
         if r.required_per_day_80 and r.required_per_day_80 > r.assigned_avg_per_day:
             util_warnings.append(f"{r.name}: 80% Ziel erfordert mehr als zugeordnete Kapazität")
 
-    if ignored_projects or util_warnings:
-        print("\nHinweise:")
-        for p in ignored_projects:
-            print(f"- Ignoriert: {p} – {ignored_reasons.get(p,'')}")
+    if plan.ignored or util_warnings:
+        print("\nHinweise:", file=out)
+        for name, reason in plan.ignored.items():
+            print(f"- Ignoriert: {name} – {reason}", file=out)
         for w in util_warnings:
-            print(f"- {w}")
+            print(f"- {w}", file=out)
+
+    return 0
+
 
+def watch(**kwargs) -> int:
+    """Run once, then again after every saved change of the config (same output file)."""
+    import os
+    from datetime import datetime
+    from .watch import FileWatcher
+
+    cfg_path = kwargs.get("config_path") or os.path.join("config", "config.yml")
+    kwargs["config_path"] = cfg_path
+    if not kwargs.get("output_path"):
+        od = kwargs.get("outdir") or "output"
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        ext = "json" if kwargs.get("fmt") == "json" else "html"
+        kwargs["output_path"] = os.path.join(od, f"forecast_{ts}.{ext}" + (".gz" if kwargs.get("gzip_output") else ""))
+    state: dict = {}
+
+    def rerun(_text: str | None = None) -> None:
+        try:
+            run(**kwargs, watch_state=state)
+        except Exception as e:
+            print(f"Fehler: {e}", file=sys.stderr)
+
+    rerun()
+    watcher = FileWatcher(cfg_path, rerun)
+    print(f"\nBeobachte {cfg_path} ({watcher.mode}) — STRG+C zum Beenden", file=sys.stderr)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
     return 0
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Forecast-Planer (CLI)")
     parser.add_argument("--config", required=False, help="Pfad zur config.yml (Default: config/config.yml)")
-    parser.add_argument("--output", help="Pfad für Exportdatei (überschreibt --outdir)")
-    # CSV-Export wurde entfernt; Ausgabe erfolgt ausschließlich als HTML
+    parser.add_argument("--output", help="Pfad für Exportdatei (überschreibt --outdir; '-' = stdout)")
+    parser.add_argument("--format", dest="fmt", choices=["html", "json"], default="html", help="Ausgabeformat: HTML-Bericht oder Plan als JSON (Default: html)")
+    parser.add_argument("--tables", choices=["static", "virtual"], default="static", help="Projekttabellen im HTML-Bericht: static (vollständiges HTML) oder virtual (Daten als JSON, im Browser gezeichnet, sortier-/filterbar; für große Portfolios)")
+    parser.add_argument("--export", action="append", choices=["csv", "jsonl", "parquet"], help="Zusätzlich Tabellen je Projekt und je Projekt/Monat exportieren (mehrfach möglich; parquet benötigt pyarrow)")
+    parser.add_argument("--csv-de", dest="csv_de", action="store_true", help="CSV im deutschen Format: Semikolon als Trennzeichen, Komma als Dezimaltrennzeichen")
     parser.add_argument("--as-of", dest="as_of", help="Stichtag (YYYY-MM-DD)")
     parser.add_argument("--planning-start", help="Start des Planungszeitraums (YYYY-MM-DD)")
     parser.add_argument("--planning-end", help="Ende des Planungszeitraums (YYYY-MM-DD)")
     parser.add_argument("--round", dest="round_hours", type=float, help="Rundung (z. B. 0.15)")
     parser.add_argument("--outdir", default="output", help="Ausgabeverzeichnis (Default: output)")
+    parser.add_argument("--simulate", type=int, metavar="RUNS", help="Monte-Carlo-Simulation der Krankheit mit RUNS Läufen (benötigt NumPy)")
+    parser.add_argument("--seed", type=int, help="Seed der Simulation (Default: 42)")
+    parser.add_argument("--workers", type=int, help="Prozesse für die Simulation (Default: 1)")
+    parser.add_argument("--gzip", dest="gzip_output", action="store_true", help="Bericht gzip-komprimiert als .html.gz schreiben (auch bei --output *.gz)")
+    parser.add_argument("--compress-level", type=int, help="gzip-Stufe 1–9 (1 = schnell, 9 = klein; Default: 6 bzw. FORECAST_COMPRESS_LEVEL)")
+    parser.add_argument("--watch", action="store_true", help="Config beobachten und Bericht bei jeder Änderung neu schreiben")
     args = parser.parse_args(argv)
     try:
-        return run(
+        return (watch if args.watch else run)(
             config_path=args.config,
             output_path=args.output,
             as_of=args.as_of,
@@ -267,6 +271,15 @@ def main(argv: list[str] | None = None) -> int:
             planning_end=args.planning_end,
             round_hours=args.round_hours,
             outdir=args.outdir,
+            simulate=args.simulate,
+            seed=args.seed,
+            workers=args.workers,
+            gzip_output=args.gzip_output,
+            compress_level=args.compress_level,
+            fmt=args.fmt,
+            tables=args.tables,
+            export=args.export,
+            csv_de=args.csv_de,
         )
     except Exception as e:
         print(f"Fehler: {e}", file=sys.stderr)
@@ -0,0 +1,105 @@
+"""
+Response/file compression: gzip (stdlib) and, if installed, zstd
+(`zstandard`) and brotli (`brotli`). Levels are per encoding; lower is
+faster, higher is smaller.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    zstandard = None  # type: ignore
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    brotli = None  # type: ignore
+
+# Level for all encodings (clamped to each encoding's range); unset = defaults below
+COMPRESS_LEVEL_ENV = "FORECAST_COMPRESS_LEVEL"
+
+# Smaller bodies are sent as is
+MIN_SIZE = 1024
+
+# encoding -> (min level, max level, default level); defaults favour latency
+LEVELS: Dict[str, Tuple[int, int, int]] = {
+    "zstd": (1, 22, 3),
+    "br": (0, 11, 4),
+    "gzip": (1, 9, 6),
+}
+
+
+def available_encodings() -> List[str]:
+    """Supported encodings in server preference order."""
+    encs = []
+    if zstandard is not None:
+        encs.append("zstd")
+    if brotli is not None:
+        encs.append("br")
+    encs.append("gzip")
+    return encs
+
+
+def env_level() -> Optional[int]:
+    """Level from FORECAST_COMPRESS_LEVEL (None if unset); raises ValueError for a non-integer."""
+    env = os.environ.get(COMPRESS_LEVEL_ENV)
+    if not env:
+        return None
+    try:
+        return int(env)
+    except ValueError:
+        raise ValueError(f"{COMPRESS_LEVEL_ENV} muss eine ganze Zahl sein, nicht {env!r}") from None
+
+
+def level_for(encoding: str, level: Optional[int] = None) -> int:
+    lo, hi, default = LEVELS[encoding]
+    if level is None:
+        level = env_level()
+        if level is None:
+            level = default
+    return max(lo, min(hi, int(level)))
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    Pick an encoding from an Accept-Encoding header: highest q-value wins,
+    ties go to the server preference (zstd, br, gzip). None = identity.
+    """
+    weights: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        parts = [p.strip() for p in item.split(";")]
+        name = parts[0].lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    best: Optional[str] = None
+    best_q = 0.0
+    for enc in available_encodings():
+        q = weights.get(enc, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    lvl = level_for(encoding, level)
+    if encoding == "gzip":
+        # mtime=0: identical input gives identical bytes (cacheable, reproducible files)
+        return gzip.compress(data, compresslevel=lvl, mtime=0)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=lvl).compress(data)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=lvl)
+    raise ValueError(f"Kompression nicht verfügbar: {encoding}")
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import date
-from typing import Dict, List, Tuple
+from math import floor
+from typing import Dict, List, Optional, Tuple
 
-from .calendar import intersection, month_key
+from .calendar import intersection
+from .backend import use_numpy
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    np = None  # type: ignore
 
 
 @dataclass
@@ -27,83 +35,220 @@ class ProjectResult:
     revenue_80: float
 
 
-def _safe_div(a: float, b: float) -> float | None:
-    if b == 0:
-        return None
-    return a / b
+def _round_to(v: float, step: float) -> float:
+    # round half away from zero to nearest multiple of step
+    if step <= 0:
+        return v
+    return step * floor(v / step + 0.5)
+
+
+def _result_columns_python(rest, rate, wd, assigned_rows, active_rows, round_hours):
+    assigned_total = []
+    for row, active in zip(assigned_rows, active_rows):
+        total = 0.0
+        for a, on in zip(row, active):
+            if on:
+                total += a
+        assigned_total.append(total)
+    assigned_avg = [a / n for a, n in zip(assigned_total, wd)]
+    req = {q: [_round_to(q * b / n, round_hours) for b, n in zip(rest, wd)] for q in (1.0, 0.9, 0.8)}
+    util = {q: [(r / a) if a > 0 else None for r, a in zip(req[q], assigned_avg)] for q in req}
+    revenue = {q: [q * b * c for b, c in zip(rest, rate)] for q in req}
+    return assigned_total, assigned_avg, req, util, revenue
+
+
+def _result_columns_numpy(rest, rate, wd, assigned_rows, active_rows, round_hours):
+    rest_a = np.array(rest, dtype=float)
+    rate_a = np.array(rate, dtype=float)
+    wd_a = np.array(wd, dtype=float)
+    A = np.array(assigned_rows, dtype=float).reshape(len(rest), -1)
+    on = np.array(active_rows, dtype=bool).reshape(A.shape)
+    # cumsum adds left to right, i.e. in the same order as the Python path
+    masked = np.where(on, A, 0.0)
+    assigned_total = np.cumsum(masked, axis=1)[:, -1] if A.shape[1] else np.zeros(len(rest))
+    assigned_avg = assigned_total / wd_a
+    req = {}
+    util = {}
+    revenue = {}
+    for q in (1.0, 0.9, 0.8):
+        v = q * rest_a / wd_a
+        if round_hours > 0:
+            v = round_hours * np.floor(v / round_hours + 0.5)
+        req[q] = v.tolist()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = v / assigned_avg
+        util[q] = [x if a > 0 else None for x, a in zip(u.tolist(), assigned_avg.tolist())]
+        revenue[q] = (q * rest_a * rate_a).tolist()
+    return assigned_total.tolist(), assigned_avg.tolist(), req, util, revenue
 
 
 def compute_results(
     planning_period: Tuple[date, date],
     projects: List[dict],  # dict: {name, start, end, rest_budget_hours, rate, weights_by_month}
-    workdays_by_project: Dict[str, List[date]],
-    assigned_capacity_by_project_month: Dict[Tuple[str, str], float],
+    workday_counts_by_project: Dict[str, Dict[str, int]],
+    assigned_capacity_by_project_month: Mapping[Tuple[str, str], float],
     round_hours: float,
 ) -> List[ProjectResult]:
-    results: List[ProjectResult] = []
+    """
+    Key figures for all projects in one columnar pass: per project the
+    assignment row and workday counts over the common months, then every
+    field is computed column-wise (NumPy if available, else plain lists).
+    """
+    kept: List[Tuple[dict, Tuple[date, date]]] = []
     for p in projects:
-        name = p["name"]
-        pj_period = (p["start"], p["end"])
-        cut = intersection(planning_period, pj_period)
+        cut = intersection(planning_period, (p["start"], p["end"]))
         if cut is None:
             continue
-        wdays = workdays_by_project.get(name, [])
-        wd_count = len(wdays)
-        if wd_count == 0:
+        if sum(workday_counts_by_project.get(p["name"], {}).values()) == 0:
             # ignore project without workdays in intersection
             continue
-
-        rest = float(p["rest_budget_hours"]) if p.get("rest_budget_hours") is not None else 0.0
-        rate = float(p["rate_eur_per_h"]) if p.get("rate_eur_per_h") is not None else 0.0
-
-        # Assigned capacity
-        assigned_total = 0.0
-        for d in wdays:
-            mk = month_key(d)
-            assigned_total += assigned_capacity_by_project_month.get((name, mk), 0.0) / max(1, len([x for x in wdays if month_key(x) == mk]))
-        # average per day from assigned
-        assigned_avg = assigned_total / wd_count if wd_count > 0 else 0.0
-
-        def r(v: float) -> float:
-            if round_hours <= 0:
-                return v
-            # round half away from zero to nearest multiple of round_hours
-            q = v / round_hours
-            from math import floor
-            return round_hours * (floor(q + 0.5))
-
-        def req_per_day(q: float) -> float:
-            need = q * rest
-            return r(need / wd_count) if wd_count > 0 else 0.0
-
-        r100 = req_per_day(1.0)
-        r90 = req_per_day(0.9)
-        r80 = req_per_day(0.8)
-
-        u100 = _safe_div(r100, assigned_avg if assigned_avg > 0 else 0.0) if assigned_avg > 0 else None
-        u90 = _safe_div(r90, assigned_avg if assigned_avg > 0 else 0.0) if assigned_avg > 0 else None
-        u80 = _safe_div(r80, assigned_avg if assigned_avg > 0 else 0.0) if assigned_avg > 0 else None
-
-        results.append(
-            ProjectResult(
-                name=name,
-                period_start=cut[0],
-                period_end=cut[1],
-                workdays=wd_count,
-                rest_budget_hours=rest,
-                required_per_day_100=r100,
-                required_per_day_90=r90,
-                required_per_day_80=r80,
-                assigned_capacity_hours=assigned_total,
-                assigned_avg_per_day=assigned_avg,
-                utilization_100=u100,
-                utilization_90=u90,
-                utilization_80=u80,
-                revenue_100=1.0 * rest * rate,
-                revenue_90=0.9 * rest * rate,
-                revenue_80=0.8 * rest * rate,
-            )
+        kept.append((p, cut))
+    if not kept:
+        return []
+
+    months = sorted({mk for p, _ in kept for mk in workday_counts_by_project[p["name"]]})
+    rest: List[float] = []
+    rate: List[float] = []
+    wd: List[int] = []
+    assigned_rows: List[List[float]] = []
+    active_rows: List[List[bool]] = []
+    row_of = getattr(assigned_capacity_by_project_month, "row", None)
+    for p, _ in kept:
+        name = p["name"]
+        counts = workday_counts_by_project[name]
+        rest.append(float(p["rest_budget_hours"]) if p.get("rest_budget_hours") is not None else 0.0)
+        rate.append(float(p["rate_eur_per_h"]) if p.get("rate_eur_per_h") is not None else 0.0)
+        wd.append(sum(counts.values()))
+        if row_of is not None:
+            assigned_rows.append(row_of(name, months))
+        else:
+            assigned_rows.append([assigned_capacity_by_project_month.get((name, mk), 0.0) for mk in months])
+        active_rows.append([counts.get(mk, 0) > 0 for mk in months])
+
+    if use_numpy():
+        columns = _result_columns_numpy(rest, rate, wd, assigned_rows, active_rows, round_hours)
+    else:
+        columns = _result_columns_python(rest, rate, wd, assigned_rows, active_rows, round_hours)
+    assigned_total, assigned_avg, req, util, revenue = columns
+
+    return [
+        ProjectResult(
+            name=p["name"],
+            period_start=cut[0],
+            period_end=cut[1],
+            workdays=wd[i],
+            rest_budget_hours=rest[i],
+            required_per_day_100=req[1.0][i],
+            required_per_day_90=req[0.9][i],
+            required_per_day_80=req[0.8][i],
+            assigned_capacity_hours=assigned_total[i],
+            assigned_avg_per_day=assigned_avg[i],
+            utilization_100=util[1.0][i],
+            utilization_90=util[0.9][i],
+            utilization_80=util[0.8][i],
+            revenue_100=revenue[1.0][i],
+            revenue_90=revenue[0.9][i],
+            revenue_80=revenue[0.8][i],
         )
+        for i, (p, cut) in enumerate(kept)
+    ]
 
-    return results
 
+@dataclass
+class BudgetLedger:
+    """
+    Budget course of one project over the plan months (lists aligned to
+    `months`): assignment, limit, use and remaining budget per month.
+    """
+    name: str
+    budget: float
+    months: List[str]
+    assigned: List[float]
+    limit: List[float]
+    used: List[float]
+    remaining_at_start: List[float]
+    remaining_at_end: List[float]
+    exhaustion_month: Optional[str]
+    last_active_month: Optional[str]
+    assigned_total: float
+    used_total: float
+
+    @property
+    def remaining(self) -> float:
+        return self.remaining_at_end[-1] if self.remaining_at_end else self.budget
+
+    @property
+    def status(self) -> str:
+        """Budget status: "ok" (used exactly by project end), "warn" (budget left) or "error" (exhausted early)."""
+        if self.remaining > 1e-9:
+            return "warn"
+        if self.last_active_month and self.exhaustion_month == self.last_active_month and abs(self.used_total - self.budget) <= 1e-6:
+            return "ok"
+        return "error"
+
+    def required_per_day(self, workday_counts: Dict[str, int]) -> List[float]:
+        """Hours per workday and month to use the whole budget, split like the assignment."""
+        total = self.assigned_total
+        out: List[float] = []
+        for mk, cap_m in zip(self.months, self.assigned):
+            days = workday_counts.get(mk, 0)
+            out.append(self.budget * (cap_m / total) / days if total > 0 and days > 0 else 0.0)
+        return out
+
+
+def compute_budget_ledgers(
+    results: List[ProjectResult],
+    months: List[str],
+    assigned_capacity_by_project_month: Mapping[Tuple[str, str], float],
+    limits_by_project: Dict[str, Dict[str, float]],
+    workday_counts_by_project: Dict[str, Dict[str, int]],
+) -> Dict[str, BudgetLedger]:
+    """
+    Ledger per project, keyed by name. The budget is consumed sequentially
+    over the months: used = min(assigned, limit, remaining budget).
+    """
+    ledgers: Dict[str, BudgetLedger] = {}
+    row_of = getattr(assigned_capacity_by_project_month, "row", None)
+    inf = float("inf")
+    for r in results:
+        budget = float(r.rest_budget_hours or 0.0)
+        if row_of is not None:
+            assigned = row_of(r.name, months)
+        else:
+            assigned = [assigned_capacity_by_project_month.get((r.name, mk), 0.0) for mk in months]
+        limits = limits_by_project.get(r.name, {})
+        limit = [float(limits.get(mk, inf)) for mk in months]
+        counts = workday_counts_by_project.get(r.name, {})
+        used: List[float] = []
+        at_start: List[float] = []
+        at_end: List[float] = []
+        exhaustion_month: Optional[str] = None
+        last_active_month: Optional[str] = None
+        remaining = budget
+        for mk, a, lim in zip(months, assigned, limit):
+            at_start.append(remaining)
+            use = min(min(a, lim), remaining)
+            if use < 0:
+                use = 0.0
+            used.append(use)
+            remaining = max(0.0, remaining - use)
+            at_end.append(remaining)
+            if remaining == 0.0 and exhaustion_month is None and use > 0:
+                exhaustion_month = mk
+            if counts.get(mk, 0) > 0:
+                last_active_month = mk
+        ledgers[r.name] = BudgetLedger(
+            name=r.name,
+            budget=budget,
+            months=months,
+            assigned=assigned,
+            limit=limit,
+            used=used,
+            remaining_at_start=at_start,
+            remaining_at_end=at_end,
+            exhaustion_month=exhaustion_month,
+            last_active_month=last_active_month,
+            assigned_total=sum(assigned),
+            used_total=sum(used),
+        )
+    return ledgers
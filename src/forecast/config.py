@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
 import os
 import yaml
 
+from .calendar import daterange, merge_intervals
+
+# libyaml parser if PyYAML was built with it (same result, much faster on large configs)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def _parse_date(s, field_name: str) -> date:
     """Accept str (YYYY-MM-DD), datetime, or date from YAML and return date."""
@@ -117,45 +122,44 @@ class CapacityConfig:
 
 @dataclass
 class CalendarConfig:
-    vacation_days: List[date] = field(default_factory=list)
+    # Sorted, merged vacation ranges [start, end]; single days are (d, d)
+    vacations: List[Tuple[date, date]] = field(default_factory=list)
     holiday_overrides_add: List[date] = field(default_factory=list)
     holiday_overrides_remove: List[date] = field(default_factory=list)
 
+    @property
+    def vacation_days(self) -> List[date]:
+        return [d for s, e in self.vacations for d in daterange(s, e)]
+
     @staticmethod
     def from_dict(d: dict) -> "CalendarConfig":
         # Accept both single dates and ranges {start, end} inside vacation_days.
         raw_vac = d.get("vacation_days") or []
 
-        def _expand_range(s: date, e: date) -> List[date]:
-            if e < s:
-                raise ValueError("calendar.vacation_days[*]: end liegt vor start")
-            out: List[date] = []
-            cur = s
-            while cur <= e:
-                out.append(cur)
-                cur = cur + timedelta(days=1)
-            return out
-
-        vacations: List[date] = []
+        ranges: List[Tuple[date, date]] = []
         for idx, x in enumerate(raw_vac):
             # Allow mapping with {start, end} or single date-like value
             if isinstance(x, dict):
                 if "start" in x and "end" in x:
                     s = _parse_date(x["start"], f"calendar.vacation_days[{idx}].start")
                     e = _parse_date(x["end"], f"calendar.vacation_days[{idx}].end")
-                    vacations.extend(_expand_range(s, e))
+                    if e < s:
+                        raise ValueError("calendar.vacation_days[*]: end liegt vor start")
+                    ranges.append((s, e))
                 elif "date" in x:
-                    vacations.append(_parse_date(x["date"], f"calendar.vacation_days[{idx}].date"))
+                    v = _parse_date(x["date"], f"calendar.vacation_days[{idx}].date")
+                    ranges.append((v, v))
                 else:
                     raise ValueError(
                         "calendar.vacation_days[*]: erwartet Datum (YYYY-MM-DD) oder Mapping mit 'start'/'end'"
                     )
             else:
-                vacations.append(_parse_date(x, f"calendar.vacation_days[{idx}]"))
+                v = _parse_date(x, f"calendar.vacation_days[{idx}]")
+                ranges.append((v, v))
         overrides = d.get("holiday_overrides") or {}
         add = [_parse_date(x, "holiday_overrides.add[*]") for x in (overrides.get("add") or [])]
         rem = [_parse_date(x, "holiday_overrides.remove[*]") for x in (overrides.get("remove") or [])]
-        return CalendarConfig(vacation_days=vacations, holiday_overrides_add=add, holiday_overrides_remove=rem)
+        return CalendarConfig(vacations=merge_intervals(ranges), holiday_overrides_add=add, holiday_overrides_remove=rem)
 
 
 @dataclass
@@ -170,6 +174,30 @@ class SicknessConfig:
         return SicknessConfig(prob_per_workday=p)
 
 
+@dataclass
+class SimulationConfig:
+    # 0 = keine Simulation (nur Erwartungswert)
+    runs: int = 0
+    seed: int = 42
+    workers: int = 1
+
+    @staticmethod
+    def from_dict(d: dict) -> "SimulationConfig":
+        s = SimulationConfig(
+            runs=int(d.get("runs", 0)),
+            seed=int(d.get("seed", 42)),
+            workers=int(d.get("workers", 1)),
+        )
+        s.validate()
+        return s
+
+    def validate(self) -> None:
+        if self.runs < 0:
+            raise ValueError("simulation.runs darf nicht negativ sein")
+        if self.workers < 1:
+            raise ValueError("simulation.workers muss >= 1 sein")
+
+
 @dataclass
 class Project:
     name: str
@@ -211,6 +239,56 @@ class Project:
                 raise ValueError(f"Projekt {self.name}: Limit {lim}h für Monat {m} darf nicht negativ sein")
 
 
+@dataclass
+class TeamMember:
+    name: str
+    capacity: CapacityConfig
+    calendar: CalendarConfig
+    sickness: SicknessConfig
+    state: Optional[str] = None
+    # None = alle Projekte
+    projects: Optional[List[str]] = None
+    # project -> month -> weight; overrides the project's weights_by_month for this member
+    weights_by_month: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @staticmethod
+    def from_dict(d: dict, capacity: CapacityConfig, calendar: CalendarConfig, sickness: SicknessConfig) -> "TeamMember":
+        """Sections not given by the member are inherited from the top-level config."""
+        if not d.get("name"):
+            raise ValueError("team[*].name ist erforderlich")
+        name = str(d["name"])
+        cal = calendar
+        if d.get("calendar") is not None:
+            cal = CalendarConfig.from_dict(d["calendar"] or {})
+            # Feiertags-Overrides gelten teamweit und werden ergänzt
+            cal.holiday_overrides_add = calendar.holiday_overrides_add + cal.holiday_overrides_add
+            cal.holiday_overrides_remove = calendar.holiday_overrides_remove + cal.holiday_overrides_remove
+        projects = d.get("projects")
+        weights: Dict[str, Dict[str, float]] = {}
+        for pname, by_month in (d.get("weights_by_month") or {}).items():
+            weights[str(pname)] = {
+                _parse_month(k, f"team[{name}].weights_by_month[{pname}][{k}]"): float(v)
+                for k, v in (by_month or {}).items()
+            }
+        m = TeamMember(
+            name=name,
+            capacity=CapacityConfig.from_dict(d["capacity"] or {}) if d.get("capacity") is not None else capacity,
+            calendar=cal,
+            sickness=SicknessConfig.from_dict(d["sickness"] or {}) if d.get("sickness") is not None else sickness,
+            state=d.get("state"),
+            projects=[str(x) for x in projects] if projects is not None else None,
+            weights_by_month=weights,
+        )
+        m.validate()
+        return m
+
+    def validate(self) -> None:
+        for pname, by_month in self.weights_by_month.items():
+            for m, w in by_month.items():
+                if w < 0 or w > 100:
+                    raise ValueError(f"Team {self.name}: Gewicht {w} für {pname}/{m} außerhalb 0–100")
+
+
 @dataclass
 class Config:
     settings: Settings
@@ -218,25 +296,52 @@ class Config:
     calendar: CalendarConfig
     sickness: SicknessConfig
     projects: List[Project]
+    team: List[TeamMember] = field(default_factory=list)
+    simulation: SimulationConfig = field(default_factory=SimulationConfig)
+
+
+def parse_config(data: dict) -> Config:
+    settings = Settings.from_dict(data.get("settings") or {})
+    capacity = CapacityConfig.from_dict(data.get("capacity") or {})
+    calendar = CalendarConfig.from_dict(data.get("calendar") or {})
+    sickness = SicknessConfig.from_dict(data.get("sickness") or {})
+    projects = [Project.from_dict(x) for x in (data.get("projects") or [])]
+
+    if not projects:
+        raise ValueError("Mindestens ein Projekt muss in projects definiert sein")
+
+    team = [TeamMember.from_dict(x or {}, capacity, calendar, sickness) for x in (data.get("team") or [])]
+    names = {p.name for p in projects}
+    seen = set()
+    for m in team:
+        if m.name in seen:
+            raise ValueError(f"Team {m.name}: Name mehrfach vergeben")
+        seen.add(m.name)
+        for pname in (m.projects or []) + list(m.weights_by_month):
+            if pname not in names:
+                raise ValueError(f"Team {m.name}: unbekanntes Projekt {pname}")
+
+    simulation = SimulationConfig.from_dict(data.get("simulation") or {})
+
+    return Config(
+        settings=settings,
+        capacity=capacity,
+        calendar=calendar,
+        sickness=sickness,
+        projects=projects,
+        team=team,
+        simulation=simulation,
+    )
+
+
+def load_yaml(text) -> dict:
+    return yaml.load(text, Loader=_YamlLoader) or {}
 
 
 def load_config(path: str) -> Config:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Config nicht gefunden: {path}")
     with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = load_yaml(f)
 
-    try:
-        settings = Settings.from_dict(data.get("settings") or {})
-        capacity = CapacityConfig.from_dict(data.get("capacity") or {})
-        calendar = CalendarConfig.from_dict(data.get("calendar") or {})
-        sickness = SicknessConfig.from_dict(data.get("sickness") or {})
-        projects = [Project.from_dict(x) for x in (data.get("projects") or [])]
-
-        if not projects:
-            raise ValueError("Mindestens ein Projekt muss in projects definiert sein")
-
-        return Config(settings=settings, capacity=capacity, calendar=calendar, sickness=sickness, projects=projects)
-    except Exception:
-        # Re-raise with context
-        raise
+    return parse_config(data)
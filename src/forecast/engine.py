@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import Config, Project, TeamMember
+from .calendar import WorkCalendar, intersection, month_key
+from .capacity import compute_capacity
+from .weights import AssignmentMatrix, assign_capacity_by_project_month
+from .compute import ProjectResult, BudgetLedger, compute_budget_ledgers, compute_results
+from .metrics import Lap
+from .team import assignment_key, calendar_key, capacity_key, member_projects_by_month, member_weights, team_members
+from .simulation import SimulationResult, simulate_plan
+
+
+@dataclass
+class PlanModel:
+    """
+    Fully computed plan for one configuration. Built once by `build_plan` and
+    shared by all outputs (CLI table, HTML report, live server).
+    """
+    planning_period: Tuple[date, date]
+    calendar: WorkCalendar
+    workdays: List[date]
+    capacity_by_date: Dict[date, float]
+    capacity_by_month: Dict[str, float]
+    projects: List[dict]
+    projects_by_month: Dict[str, List[str]]
+    workday_counts_by_project: Dict[str, Dict[str, int]]
+    months_by_project: Dict[str, List[str]]
+    limits_by_project: Dict[str, Dict[str, float]]
+    assigned: AssignmentMatrix
+    results: List[ProjectResult]
+    months: List[str]
+    ledgers: Dict[str, BudgetLedger]
+    ignored: Dict[str, str] = field(default_factory=dict)
+    # Team mode only: capacity per member and month, assignment per member
+    member_capacity_by_month: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    assigned_by_member: Dict[str, AssignmentMatrix] = field(default_factory=dict)
+    # Monte Carlo sickness simulation (only if simulation.runs > 0)
+    simulation: Optional[SimulationResult] = None
+
+
+def _months_between(start: date, end: date) -> List[str]:
+    months: List[str] = []
+    d = start.replace(day=1)
+    while d <= end:
+        months.append(month_key(d))
+        if d.month == 12:
+            d = d.replace(year=d.year + 1, month=1)
+        else:
+            d = d.replace(month=d.month + 1)
+    return months
+
+
+def _project_entry(p: Project, planning_period: Tuple[date, date], calendar: WorkCalendar):
+    """
+    Project cut to the planning period: None if outside, the reason (str) if
+    ignored, else (project dict, months of the cut, workdays per month).
+    """
+    cut = intersection(planning_period, (p.start, p.end))
+    if cut is None:
+        return None
+    if calendar.count_workdays(cut[0], cut[1]) == 0:
+        return "Keine verbleibenden Arbeitstage im Planungsschnitt"
+    proj = {
+        "name": p.name,
+        "start": cut[0],
+        "end": cut[1],
+        "rest_budget_hours": p.rest_budget_hours,
+        "rate_eur_per_h": p.rate_eur_per_h,
+        "weights_by_month": dict(p.weights_by_month),
+    }
+    return proj, _months_between(cut[0], cut[1]), calendar.workdays_by_month(cut[0], cut[1])
+
+
+def build_plan(cfg: Config) -> PlanModel:
+    lap = Lap()
+    planning_period = (cfg.settings.planning_period.start, cfg.settings.planning_period.end)
+
+    # Workday index for the overall planning period; project cuts are sub-ranges.
+    # Team mode: the team calendar (state holidays and team-wide overrides, no
+    # vacations), since top-level vacations are those of members inheriting them
+    calendar = WorkCalendar.build(
+        planning_period,
+        cfg.settings.state,
+        cfg.calendar.holiday_overrides_add,
+        cfg.calendar.holiday_overrides_remove,
+        [] if cfg.team else cfg.calendar.vacations,
+    )
+    all_workdays = calendar.workdays
+    lap("calendar")
+
+    members = team_members(cfg)
+
+    # Capacity per date (after sickness reduction); members with identical
+    # calendar and capacity settings share one computation
+    calendars: Dict[tuple, WorkCalendar] = {} if cfg.team else {calendar_key(cfg.settings.state, cfg.calendar): calendar}
+    capacities: Dict[tuple, Tuple[Dict[date, float], Dict[str, float]]] = {}
+    member_capacity_key: Dict[str, tuple] = {}
+    multiplicity: Dict[tuple, int] = {}
+    for m in members:
+        state = m.state or cfg.settings.state
+        ckey = calendar_key(state, m.calendar)
+        if ckey not in calendars:
+            calendars[ckey] = WorkCalendar.build(
+                planning_period,
+                state,
+                m.calendar.holiday_overrides_add,
+                m.calendar.holiday_overrides_remove,
+                m.calendar.vacations,
+            )
+        key = capacity_key(ckey, m.capacity, m.sickness)
+        if key not in capacities:
+            capacities[key] = compute_capacity(
+                workdays=calendars[ckey].workdays,
+                per_weekday=m.capacity.per_weekday,
+                interval_overrides=[(o.start, o.end, o.hours_per_day) for o in m.capacity.interval_overrides],
+                sick_prob_per_workday=m.sickness.prob_per_workday,
+            )
+        member_capacity_key[m.name] = key
+        multiplicity[key] = multiplicity.get(key, 0) + 1
+
+    if len(capacities) == 1 and len(members) == 1:
+        capacity_by_date, capacity_by_month = next(iter(capacities.values()))
+    else:
+        capacity_by_date = {}
+        capacity_by_month = {}
+        for key, (by_date, by_month) in capacities.items():
+            n = multiplicity[key]
+            for d, h in by_date.items():
+                capacity_by_date[d] = capacity_by_date.get(d, 0.0) + h * n
+            for mk, h in by_month.items():
+                capacity_by_month[mk] = capacity_by_month.get(mk, 0.0) + h * n
+        capacity_by_date = dict(sorted(capacity_by_date.items()))
+        capacity_by_month = dict(sorted(capacity_by_month.items()))
+    calendar.set_capacity(capacity_by_date)
+    lap("capacity")
+
+    # Determine active projects per month within planning cut
+    projects: List[dict] = []
+    projects_by_month: Dict[str, List[str]] = {}
+    explicit_weights: Dict[str, Dict[str, float]] = {}
+    limits_by_project: Dict[str, Dict[str, float]] = {}
+    workday_counts_by_project: Dict[str, Dict[str, int]] = {}
+    ignored: Dict[str, str] = {}
+
+    months_by_project: Dict[str, List[str]] = {}
+
+    for p in cfg.projects:
+        entry = _project_entry(p, planning_period, calendar)
+        if entry is None:
+            continue
+        if isinstance(entry, str):
+            ignored[p.name] = entry
+            continue
+        proj, project_months, counts = entry
+        projects.append(proj)
+        for m in project_months:
+            projects_by_month.setdefault(m, []).append(p.name)
+        months_by_project[p.name] = project_months
+        explicit_weights[p.name] = dict(p.weights_by_month)
+        limits_by_project[p.name] = dict(getattr(p, "limits_by_month", {}) or {})
+        workday_counts_by_project[p.name] = counts
+    lap("projects")
+
+    # Assignment per member, summed per (project, month); members with the
+    # same capacity, projects and weights are assigned once
+    assigned = AssignmentMatrix([p["name"] for p in projects], list(capacity_by_month))
+    assigned_by_member: Dict[str, AssignmentMatrix] = {}
+    member_capacity_by_month: Dict[str, Dict[str, float]] = {}
+    groups: Dict[tuple, List[TeamMember]] = {}
+    for m in members:
+        groups.setdefault(assignment_key(member_capacity_key[m.name], m), []).append(m)
+    for gkey, group in groups.items():
+        m = group[0]
+        member_months = capacities[member_capacity_key[m.name]][1]
+        try:
+            member_assigned = assign_capacity_by_project_month(
+                member_months,
+                member_projects_by_month(m, projects_by_month),
+                member_weights(m, explicit_weights),
+            )
+        except ValueError as e:
+            if not m.name:
+                raise
+            raise ValueError(f"Team {m.name}: {e}") from e
+        n = len(group)
+        if n == 1 and len(groups) == 1:
+            assigned = member_assigned
+        else:
+            assigned.add(member_assigned, n)
+        if cfg.team:
+            for tm in group:
+                assigned_by_member[tm.name] = member_assigned
+                member_capacity_by_month[tm.name] = member_months
+    lap("weights")
+
+    results = compute_results(
+        planning_period=planning_period,
+        projects=projects,
+        workday_counts_by_project=workday_counts_by_project,
+        assigned_capacity_by_project_month=assigned,
+        round_hours=cfg.settings.round_hours,
+    )
+
+    # All month keys present in any project's workdays
+    months = sorted({mk for counts in workday_counts_by_project.values() for mk in counts})
+    lap("compute")
+
+    ledgers = compute_budget_ledgers(results, months, assigned, limits_by_project, workday_counts_by_project)
+    lap("usage")
+
+    plan = PlanModel(
+        planning_period=planning_period,
+        calendar=calendar,
+        workdays=all_workdays,
+        capacity_by_date=capacity_by_date,
+        capacity_by_month=capacity_by_month,
+        projects=projects,
+        projects_by_month=projects_by_month,
+        workday_counts_by_project=workday_counts_by_project,
+        months_by_project=months_by_project,
+        limits_by_project=limits_by_project,
+        assigned=assigned,
+        results=results,
+        months=months,
+        ledgers=ledgers,
+        ignored=ignored,
+        member_capacity_by_month=member_capacity_by_month,
+        assigned_by_member=assigned_by_member,
+    )
+    if cfg.simulation.runs > 0:
+        plan.simulation = simulate_plan(cfg, plan, cfg.simulation.runs, cfg.simulation.seed, cfg.simulation.workers)
+        lap("simulation")
+    return plan
+
+
+def _changed_months(old: Dict, new: Dict) -> Set[str]:
+    """Month keys of two date- or month-keyed mappings whose values differ."""
+    keys = set(old) | set(new)
+    return {k if isinstance(k, str) else month_key(k) for k in keys if old.get(k) != new.get(k)}
+
+
+def update_plan(prev_cfg: Optional[Config], prev: Optional[PlanModel], cfg: Config) -> PlanModel:
+    """
+    Recompute `prev` (built from `prev_cfg`) for the edited `cfg`, touching
+    only what the edit affects: months whose capacity, workdays, active
+    projects or weights changed are reassigned, and results/ledgers are
+    recomputed only for projects active in those months or edited
+    themselves. Falls back to `build_plan` for settings and team changes.
+    Gives the same plan as `build_plan(cfg)`.
+    """
+    if (
+        prev is None
+        or prev_cfg is None
+        or cfg.team
+        or prev_cfg.team
+        or cfg.settings != prev_cfg.settings
+    ):
+        return build_plan(cfg)
+    lap = Lap()
+    planning_period = prev.planning_period
+
+    # Calendar and capacity: rebuilt only if their sections changed (cheap, O(days))
+    dirty_months: Set[str] = set()
+    workday_months: Set[str] = set()
+    if (cfg.calendar, cfg.capacity, cfg.sickness) != (prev_cfg.calendar, prev_cfg.capacity, prev_cfg.sickness):
+        calendar = WorkCalendar.build(
+            planning_period,
+            cfg.settings.state,
+            cfg.calendar.holiday_overrides_add,
+            cfg.calendar.holiday_overrides_remove,
+            cfg.calendar.vacations,
+        )
+        lap("calendar")
+        capacity_by_date, capacity_by_month = compute_capacity(
+            workdays=calendar.workdays,
+            per_weekday=cfg.capacity.per_weekday,
+            interval_overrides=[(o.start, o.end, o.hours_per_day) for o in cfg.capacity.interval_overrides],
+            sick_prob_per_workday=cfg.sickness.prob_per_workday,
+        )
+        calendar.set_capacity(capacity_by_date)
+        workday_months = {month_key(d) for d in set(calendar.workdays) ^ set(prev.workdays)}
+        dirty_months |= _changed_months(prev.capacity_by_month, capacity_by_month)
+    else:
+        calendar = prev.calendar
+        capacity_by_date = prev.capacity_by_date
+        capacity_by_month = prev.capacity_by_month
+    lap("capacity")
+
+    prev_defs = {p.name: p for p in prev_cfg.projects}
+    prev_projects = {p["name"]: p for p in prev.projects}
+    projects: List[dict] = []
+    projects_by_month: Dict[str, List[str]] = {}
+    explicit_weights: Dict[str, Dict[str, float]] = {}
+    limits_by_project: Dict[str, Dict[str, float]] = {}
+    workday_counts_by_project: Dict[str, Dict[str, int]] = {}
+    months_by_project: Dict[str, List[str]] = {}
+    ignored: Dict[str, str] = {}
+    # Projects whose own definition or workday counts changed
+    touched: Set[str] = set()
+
+    for p in cfg.projects:
+        old = prev_defs.get(p.name)
+        reuse = old == p and (p.name in prev_projects or p.name in prev.ignored)
+        if reuse and workday_months:
+            old_months = prev.months_by_project.get(p.name)
+            # Ignored projects are re-evaluated, kept ones only if a changed workday falls into their cut
+            reuse = old_months is not None and not workday_months.intersection(old_months)
+        if reuse and p.name in prev.ignored:
+            ignored[p.name] = prev.ignored[p.name]
+            continue
+        if reuse:
+            proj = prev_projects[p.name]
+            project_months = prev.months_by_project[p.name]
+            counts = prev.workday_counts_by_project[p.name]
+        else:
+            touched.add(p.name)
+            entry = _project_entry(p, planning_period, calendar)
+            if entry is None:
+                continue
+            if isinstance(entry, str):
+                ignored[p.name] = entry
+                continue
+            proj, project_months, counts = entry
+            # Months where this project's activity or weights differ
+            if old is None or old.weights_by_month != p.weights_by_month or prev.months_by_project.get(p.name) != project_months:
+                dirty_months |= set(project_months) | set(prev.months_by_project.get(p.name, []))
+        projects.append(proj)
+        for m in project_months:
+            projects_by_month.setdefault(m, []).append(p.name)
+        months_by_project[p.name] = project_months
+        explicit_weights[p.name] = dict(p.weights_by_month)
+        limits_by_project[p.name] = dict(getattr(p, "limits_by_month", {}) or {})
+        workday_counts_by_project[p.name] = counts
+
+    # Removed projects free their months; changed active lists (order included) are dirty too
+    for name, old_months in prev.months_by_project.items():
+        if name not in months_by_project:
+            dirty_months |= set(old_months)
+    for mk in set(projects_by_month) | set(prev.projects_by_month):
+        if projects_by_month.get(mk) != prev.projects_by_month.get(mk):
+            dirty_months.add(mk)
+    lap("projects")
+
+    previous = prev.assigned if set(capacity_by_month) <= set(prev.assigned.months) else None
+    assigned = assign_capacity_by_project_month(
+        capacity_by_month, projects_by_month, explicit_weights, previous=previous, dirty_months=dirty_months
+    )
+    lap("weights")
+
+    months = sorted({mk for counts in workday_counts_by_project.values() for mk in counts})
+    affected = set(touched)
+    for mk in dirty_months:
+        affected.update(projects_by_month.get(mk, []))
+    if previous is None:
+        affected = {p["name"] for p in projects}
+
+    prev_results = {r.name: r for r in prev.results}
+    changed = compute_results(
+        planning_period=planning_period,
+        projects=[p for p in projects if p["name"] in affected or p["name"] not in prev_results],
+        workday_counts_by_project=workday_counts_by_project,
+        assigned_capacity_by_project_month=assigned,
+        round_hours=cfg.settings.round_hours,
+    )
+    new_results = {r.name: r for r in changed}
+    results = [new_results.get(p["name"]) or prev_results[p["name"]] for p in projects]
+    lap("compute")
+
+    if months != prev.months:
+        ledgers = compute_budget_ledgers(results, months, assigned, limits_by_project, workday_counts_by_project)
+    else:
+        redo = [r for r in results if r.name in new_results or r.name not in prev.ledgers]
+        fresh = compute_budget_ledgers(redo, months, assigned, limits_by_project, workday_counts_by_project)
+        ledgers = {r.name: fresh.get(r.name) or prev.ledgers[r.name] for r in results}
+    lap("usage")
+
+    plan = PlanModel(
+        planning_period=planning_period,
+        calendar=calendar,
+        workdays=calendar.workdays,
+        capacity_by_date=capacity_by_date,
+        capacity_by_month=capacity_by_month,
+        projects=projects,
+        projects_by_month=projects_by_month,
+        workday_counts_by_project=workday_counts_by_project,
+        months_by_project=months_by_project,
+        limits_by_project=limits_by_project,
+        assigned=assigned,
+        results=results,
+        months=months,
+        ledgers=ledgers,
+        ignored=ignored,
+    )
+    if cfg.simulation.runs > 0:
+        plan.simulation = simulate_plan(cfg, plan, cfg.simulation.runs, cfg.simulation.seed, cfg.simulation.workers)
+        lap("simulation")
+    return plan
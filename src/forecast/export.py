@@ -0,0 +1,253 @@
+"""
+Machine-readable plan output. The JSON document is produced as a sequence
+of chunks (one per project), so large portfolios can be written to a file
+or socket without building the whole text first.
+
+Flat exports (`--export csv|jsonl|parquet`): one table per project and one
+per project and month, written row by row through an exporter from
+`EXPORTERS`.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import asdict
+import json
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .engine import PlanModel
+
+# Bump when fields are renamed or removed (additions keep the version)
+PLAN_JSON_VERSION = 1
+
+# Hours and amounts are rounded to this many decimals
+JSON_DECIMALS = 4
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _r(x: Optional[float]) -> Optional[float]:
+    return None if x is None else round(x, JSON_DECIMALS)
+
+
+def _rs(xs: List[float]) -> List[float]:
+    return [round(x, JSON_DECIMALS) for x in xs]
+
+
+def plan_project_json(plan: PlanModel, r) -> dict:
+    """Project entry: totals, targets, budget status and month columns aligned to `months`."""
+    ledger = plan.ledgers[r.name]
+    counts = plan.workday_counts_by_project.get(r.name, {})
+    return {
+        "name": r.name,
+        "start": r.period_start.isoformat(),
+        "end": r.period_end.isoformat(),
+        "workdays": r.workdays,
+        "rest_budget_hours": _r(r.rest_budget_hours),
+        "assigned_hours": _r(ledger.assigned_total),
+        "assigned_avg_per_day": _r(r.assigned_avg_per_day),
+        "used_hours": _r(ledger.used_total),
+        "unused_hours": _r(max(0.0, ledger.assigned_total - ledger.used_total)),
+        "required_per_day": {"100": _r(r.required_per_day_100), "90": _r(r.required_per_day_90), "80": _r(r.required_per_day_80)},
+        "utilization": {"100": _r(r.utilization_100), "90": _r(r.utilization_90), "80": _r(r.utilization_80)},
+        "revenue": {"100": _r(r.revenue_100), "90": _r(r.revenue_90), "80": _r(r.revenue_80)},
+        "budget": {
+            "status": ledger.status,
+            "remaining_hours": _r(ledger.remaining),
+            "exhaustion_month": ledger.exhaustion_month,
+        },
+        "monthly": {
+            "workdays": [counts.get(mk, 0) for mk in plan.months],
+            "assigned": _rs(ledger.assigned),
+            "used": _rs(ledger.used),
+            "unused": _rs([max(0.0, a - u) for a, u in zip(ledger.assigned, ledger.used)]),
+            "required_per_day": _rs(ledger.required_per_day(counts)),
+            "remaining_at_end": _rs(ledger.remaining_at_end),
+        },
+    }
+
+
+def iter_plan_json(plan: PlanModel) -> Iterator[str]:
+    """The plan as one compact JSON document, yielded in chunks."""
+    head = {
+        "version": PLAN_JSON_VERSION,
+        "planning_period": {"start": plan.planning_period[0].isoformat(), "end": plan.planning_period[1].isoformat()},
+        "months": plan.months,
+        "capacity_by_month": {mk: _r(plan.capacity_by_month.get(mk, 0.0)) for mk in plan.months},
+    }
+    # Open the project list inside the head object
+    yield _dumps(head)[:-1] + ',"projects":['
+    for i, r in enumerate(plan.results):
+        yield ("," if i else "") + _dumps(plan_project_json(plan, r))
+    tail = {"ignored": plan.ignored}
+    if plan.simulation is not None:
+        tail["simulation"] = asdict(plan.simulation)
+    yield "]," + _dumps(tail)[1:]
+
+
+# ---------------- Flat exports ----------------
+
+# (name, type) with type "str", "int" or "float"; values may be None
+Columns = Sequence[Tuple[str, str]]
+
+PROJECT_COLUMNS: Columns = (
+    ("project", "str"), ("start", "str"), ("end", "str"), ("workdays", "int"), ("rest_budget_hours", "float"),
+    ("assigned_hours", "float"), ("assigned_avg_per_day", "float"), ("used_hours", "float"), ("unused_hours", "float"),
+    ("remaining_hours", "float"), ("status", "str"), ("exhaustion_month", "str"),
+    ("required_per_day_100", "float"), ("required_per_day_90", "float"), ("required_per_day_80", "float"),
+    ("utilization_100", "float"), ("utilization_90", "float"), ("utilization_80", "float"),
+    ("revenue_100", "float"), ("revenue_90", "float"), ("revenue_80", "float"),
+)
+
+MONTH_COLUMNS: Columns = (
+    ("project", "str"), ("month", "str"), ("workdays", "int"), ("assigned_hours", "float"), ("used_hours", "float"),
+    ("unused_hours", "float"), ("required_per_day", "float"), ("remaining_at_start", "float"), ("remaining_at_end", "float"),
+)
+
+
+def iter_project_rows(plan: PlanModel) -> Iterator[tuple]:
+    """One row per project in `PROJECT_COLUMNS` order."""
+    for r in plan.results:
+        ledger = plan.ledgers[r.name]
+        yield (
+            r.name, r.period_start.isoformat(), r.period_end.isoformat(), r.workdays, _r(r.rest_budget_hours),
+            _r(ledger.assigned_total), _r(r.assigned_avg_per_day), _r(ledger.used_total),
+            _r(max(0.0, ledger.assigned_total - ledger.used_total)),
+            _r(ledger.remaining), ledger.status, ledger.exhaustion_month,
+            _r(r.required_per_day_100), _r(r.required_per_day_90), _r(r.required_per_day_80),
+            _r(r.utilization_100), _r(r.utilization_90), _r(r.utilization_80),
+            _r(r.revenue_100), _r(r.revenue_90), _r(r.revenue_80),
+        )
+
+
+def iter_month_rows(plan: PlanModel) -> Iterator[tuple]:
+    """One row per project and month of the planning period, in `MONTH_COLUMNS` order."""
+    for r in plan.results:
+        ledger = plan.ledgers[r.name]
+        counts = plan.workday_counts_by_project.get(r.name, {})
+        required = ledger.required_per_day(counts)
+        for j, mk in enumerate(plan.months):
+            assigned, used = ledger.assigned[j], ledger.used[j]
+            yield (
+                r.name, mk, counts.get(mk, 0), _r(assigned), _r(used), _r(max(0.0, assigned - used)),
+                _r(required[j]), _r(ledger.remaining_at_start[j]), _r(ledger.remaining_at_end[j]),
+            )
+
+
+# Table name -> (columns, row generator); each table goes to its own file
+EXPORT_TABLES = {
+    "projects": (PROJECT_COLUMNS, iter_project_rows),
+    "monthly": (MONTH_COLUMNS, iter_month_rows),
+}
+
+
+class CsvExporter:
+    """CSV with header. `decimal_comma`: German format (";" separated, "1234,5")."""
+
+    extension = "csv"
+
+    @staticmethod
+    def check() -> None:
+        pass
+
+    def __init__(self, path: str, columns: Columns, decimal_comma: bool = False):
+        self._f = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._f, delimiter=";" if decimal_comma else ",")
+        self._decimal_comma = decimal_comma
+        self._writer.writerow([name for name, _ in columns])
+
+    def write(self, row: tuple) -> None:
+        if self._decimal_comma:
+            row = tuple(str(v).replace(".", ",") if isinstance(v, float) else v for v in row)
+        self._writer.writerow(row)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class JsonlExporter:
+    """One JSON object per line."""
+
+    extension = "jsonl"
+
+    @staticmethod
+    def check() -> None:
+        pass
+
+    def __init__(self, path: str, columns: Columns, decimal_comma: bool = False):
+        self._f = open(path, "w", encoding="utf-8")
+        self._names = [name for name, _ in columns]
+
+    def write(self, row: tuple) -> None:
+        self._f.write(_dumps(dict(zip(self._names, row))))
+        self._f.write("\n")
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetExporter:
+    """Parquet via pyarrow; rows are buffered and written as row groups of `BATCH_ROWS`."""
+
+    extension = "parquet"
+    BATCH_ROWS = 16384
+
+    @staticmethod
+    def check():
+        """The pyarrow module; imported here so that server and workers don't pay for it."""
+        try:
+            import pyarrow  # type: ignore
+            import pyarrow.parquet  # type: ignore
+        except Exception:
+            raise ValueError("Parquet-Export benötigt pyarrow (pip install -e .[parquet])") from None
+        return pyarrow
+
+    def __init__(self, path: str, columns: Columns, decimal_comma: bool = False):
+        pa = self._pa = self.check()
+        types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+        self._schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._writer = pa.parquet.ParquetWriter(path, self._schema)
+        self._rows: List[tuple] = []
+
+    def write(self, row: tuple) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.BATCH_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        columns = list(zip(*self._rows))
+        pa = self._pa
+        self._writer.write_table(pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, self._schema)], schema=self._schema))
+        self._rows = []
+
+    def close(self) -> None:
+        if self._rows:
+            self._flush()
+        self._writer.close()
+
+
+EXPORTERS = {
+    "csv": CsvExporter,
+    "jsonl": JsonlExporter,
+    "parquet": ParquetExporter,
+}
+
+
+def write_exports(plan: PlanModel, fmt: str, base_path: str, decimal_comma: bool = False) -> List[str]:
+    """
+    Write every table of `EXPORT_TABLES` as `<base_path>_<table>.<ext>`
+    with the exporter `fmt`; returns the written paths.
+    """
+    exporter_cls = EXPORTERS[fmt]
+    paths = []
+    for table, (columns, rows) in EXPORT_TABLES.items():
+        path = f"{base_path}_{table}.{exporter_cls.extension}"
+        exporter = exporter_cls(path, columns, decimal_comma=decimal_comma)
+        try:
+            for row in rows(plan):
+                exporter.write(row)
+        finally:
+            exporter.close()
+        paths.append(path)
+    return paths
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import Iterable, List, Optional
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
     from tabulate import tabulate  # type: ignore
@@ -9,24 +10,45 @@ except Exception:  # pragma: no cover
     tabulate = None  # type: ignore
 
 
-def format_number_de(x: Optional[float], decimals: int = 2) -> str:
-    if x is None:
-        return "-"
-    neg = x < 0
-    x = abs(x)
-    s = f"{x:.{decimals}f}"
-    intp, frac = s.split(".")
-    groups = []
-    while intp:
-        groups.append(intp[-3:])
-        intp = intp[:-3]
-    intf = ".".join(reversed(groups)) if groups else "0"
-    s = f"{intf},{frac}"
-    if neg:
-        s = "-" + s
+# Python's grouped format (1,234.56) becomes German (1.234,56) in one translate
+_DE_SEPARATORS = str.maketrans(",.", ".,")
+# Memoized texts per number of decimals; report cells repeat a lot ("0,00")
+_DE_CACHE_MAX = 65536
+_de_caches: Dict[int, Tuple[str, Dict[object, str]]] = {}
+
+
+def _de_cache(decimals: int) -> Tuple[str, Dict[object, str]]:
+    entry = _de_caches.get(decimals)
+    if entry is None:
+        entry = _de_caches.setdefault(decimals, (f",.{decimals}f", {None: "-"}))
+    return entry
+
+
+def _format_de_miss(x: Optional[float], spec: str, cache: Dict[object, str]) -> str:
+    # -0.0 prints as 0,00; small negatives keep their sign ("-0,00")
+    s = format(x if x != 0 else 0.0, spec).translate(_DE_SEPARATORS)
+    if len(cache) < _DE_CACHE_MAX:
+        cache[x] = s
     return s
 
 
+def format_number_de(x: Optional[float], decimals: int = 2) -> str:
+    spec, cache = _de_cache(decimals)
+    s = cache.get(x)
+    return s if s is not None else _format_de_miss(x, spec, cache)
+
+
+def format_numbers_de(values: Iterable[Optional[float]], decimals: int = 2) -> List[str]:
+    """A whole row or column at once; same texts as `format_number_de`."""
+    spec, cache = _de_cache(decimals)
+    get = cache.get
+    out = []
+    for x in values:
+        s = get(x)
+        out.append(s if s is not None else _format_de_miss(x, spec, cache))
+    return out
+
+
 def format_currency_eur(x: Optional[float]) -> str:
     if x is None:
         return "-"
@@ -50,24 +72,17 @@ def render_table(rows: List[dict]) -> str:
         "Umsatz 90%",
         "Umsatz 80%",
     ]
-    table = []
-    for r in rows:
-        table.append([
-            r["Projekt"],
-            r["Zeitraum"],
-            r["Tage"],
-            format_number_de(r["Kapazität (h)"], 2),
-            format_number_de(r["ØKap/Tag"], 2),
-            format_number_de(r["Øh/Tag 100%"], 2),
-            format_number_de(r["Øh/Tag 90%"], 2),
-            format_number_de(r["Øh/Tag 80%"], 2),
-            format_number_de(r["Util 100%"], 2),
-            format_number_de(r["Util 90%"], 2),
-            format_number_de(r["Util 80%"], 2),
-            format_currency_eur(r["Umsatz 100%"]),
-            format_currency_eur(r["Umsatz 90%"]),
-            format_currency_eur(r["Umsatz 80%"]),
-        ])
+    # Column by column: each numeric column is formatted in one batch
+    hours = [format_numbers_de([r[h] for r in rows]) for h in headers[3:11]]
+    revenue = [[format_currency_eur(r[h]) for r in rows] for h in headers[11:]]
+    table = [
+        [r["Projekt"], r["Zeitraum"], r["Tage"], *cells]
+        for r, *cells in zip(rows, *hours, *revenue)
+    ]
+    return render_rows(headers, table)
+
+
+def render_rows(headers: List[str], table: List[List[str]]) -> str:
     if tabulate:
         return tabulate(table, headers=headers, tablefmt="github")
     # Fallback simple formatting
@@ -79,11 +94,6 @@ def render_table(rows: List[dict]) -> str:
     return "\n".join(lines)
 
 
-"""
-CSV-Export wurde entfernt. Der HTML-Export ist die primäre Ausgabe.
-"""
-
-
 # ---------------- HTML Export ----------------
 
 def _html_escape(s: str) -> str:
@@ -96,45 +106,150 @@ def _html_escape(s: str) -> str:
     )
 
 
-def _render_html_table(headers, rows: List[List[str]], row_classes: List[str] | None = None) -> str:
+def _iter_html_table(headers, rows: Iterable[List[str]], row_classes: List[str] | None = None) -> Iterator[str]:
+    """Table markup in chunks of one row; `rows` may be a generator and is consumed once."""
     def _th(h):
         if isinstance(h, tuple) and len(h) == 2:
             label, title = h
             return f"<th title=\"{_html_escape(str(title))}\">{_html_escape(str(label))}</th>"
         return f"<th>{_html_escape(str(h))}</th>"
     ths = "".join(_th(h) for h in headers)
-    trs = []
+    yield f"<table><thead><tr>{ths}</tr></thead><tbody>"
     for idx, r in enumerate(rows):
         tds = "".join(f"<td>{_html_escape(str(v))}</td>" for v in r)
         cls = ""
         if row_classes and idx < len(row_classes) and row_classes[idx]:
             cls = f" class=\"{_html_escape(row_classes[idx])}\""
-        trs.append(f"<tr{cls}>{tds}</tr>")
-    tbody = "\n".join(trs)
-    return f"<table><thead><tr>{ths}</tr></thead><tbody>{tbody}</tbody></table>"
+        yield f"\n<tr{cls}>{tds}</tr>" if idx else f"<tr{cls}>{tds}</tr>"
+    yield "</tbody></table>"
 
 
-def export_html_page(
-    title: str,
-    overview_items: List[tuple[str, str]],
-    vacations: List[str],
-    proj_summary_headers: List[str],
-    proj_summary_rows: List[List[str]],
-    cap_headers: List[str],
-    cap_rows: List[List[str]],
-    perday_headers: List[str],
-    perday_rows: List[List[str]],
-    req_headers: List[str],
-    req_rows: List[List[str]],
-    used_headers: List[str],
-    used_rows: List[List[str]],
-    budget_headers: List[str],
-    budget_rows: List[List[str]],
-    budget_row_classes: List[str] | None = None,
-    monthly_stack_chart_html: str | None = None,
-    monthly_project_chart_html: str | None = None,
-) -> str:
-    styles = """
+def _render_html_table(headers, rows: Iterable[List[str]], row_classes: List[str] | None = None) -> str:
+    return "".join(_iter_html_table(headers, rows, row_classes))
+
+
+_json_cells = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+# "<", ">" and "&" only occur inside JSON strings, where \uXXXX escapes are
+# equivalent; without them "<!--<script>" in a name would keep the parser
+# from ever closing the script element
+_SCRIPT_JSON_ESCAPES = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026"})
+
+
+def _script_json(value) -> str:
+    return _json_cells(value).translate(_SCRIPT_JSON_ESCAPES)
+
+
+def _iter_virtual_table(table_id: str, headers, rows: Iterable[List[str]], row_classes: List[str] | None = None) -> Iterator[str]:
+    """
+    Table whose rows are embedded once as JSON (one row per chunk) and drawn
+    by `VIRTUAL_TABLE_SCRIPT`: only the visible rows exist in the DOM, the
+    header sorts, the input field filters.
+    """
+    def _th(h):
+        if isinstance(h, tuple) and len(h) == 2:
+            label, title = h
+            return f"<th title=\"{_html_escape(str(title))}\">{_html_escape(str(label))}</th>"
+        return f"<th>{_html_escape(str(h))}</th>"
+    ths = "".join(_th(h) for h in headers)
+    vid = f"vt-{table_id}"
+    yield (
+        f"<div class=\"vt\" id=\"{vid}\"><div class=\"vt-bar\"><input type=\"search\" placeholder=\"Filtern …\">"
+        f" <span class=\"vt-count muted\"></span></div><div class=\"vt-scroll\">"
+        f"<table><thead><tr>{ths}</tr></thead><tbody></tbody></table></div></div>"
+    )
+    yield f"<script type=\"application/json\" id=\"{vid}-data\">{{\"k\":{_script_json(list(row_classes or []))},\"r\":["
+    for idx, r in enumerate(rows):
+        cells = _script_json([str(v) for v in r])
+        yield f"\n,{cells}" if idx else cells
+    yield "]}</script>"
+
+
+# Client side of `_iter_virtual_table`; included once per page (static reports stay without it)
+VIRTUAL_TABLE_SCRIPT = """<style>
+.vt-bar { margin: 12px 0 6px; font-size: 13px; }
+.vt-scroll { max-height: 70vh; overflow: auto; border: 1px solid #ddd; }
+.vt-scroll table { margin: 0; }
+.vt-scroll th { position: sticky; top: 0; cursor: pointer; white-space: nowrap; }
+.vt-scroll th[data-sort=asc]::after { content: " ▲"; }
+.vt-scroll th[data-sort=desc]::after { content: " ▼"; }
+.vt-scroll td { white-space: nowrap; }
+.vt-scroll tr.vt-pad td { padding: 0; border: 0; }
+</style>
+<script>
+(function () {
+  var NUM = /^-?\\d{1,3}(\\.\\d{3})*(,\\d+)?(?=\\s|%|$)/;
+  function esc(s) { return s.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;'); }
+  // Sort key: German number at the start of the cell, otherwise the text
+  function key(s) {
+    var m = NUM.exec(s);
+    return m ? [0, parseFloat(m[0].replace(/\\./g, '').replace(',', '.'))] : [1, s];
+  }
+  function cmp(a, b) { return a[0] ? a[1].localeCompare(b[1], 'de') : a[1] - b[1]; }
+  function init(box) {
+    var data = JSON.parse(document.getElementById(box.id + '-data').textContent);
+    var rows = data.r, cls = data.k, cols = box.querySelectorAll('th').length;
+    var scroll = box.querySelector('.vt-scroll'), body = box.querySelector('tbody');
+    var input = box.querySelector('input'), count = box.querySelector('.vt-count');
+    var view = rows.map(function (_, i) { return i; }), order = view.slice();
+    var rowH = 30, measured = false, queued = false, lower = null, sortCol = -1, asc = true;
+    function pad(h) { return '<tr class="vt-pad"><td colspan="' + cols + '" style="height:' + h + 'px"></td></tr>'; }
+    function render() {
+      queued = false;
+      var first = Math.max(0, Math.floor(scroll.scrollTop / rowH) - 10);
+      var last = Math.min(view.length, first + Math.ceil((scroll.clientHeight || 600) / rowH) + 20);
+      var html = [pad(first * rowH)];
+      for (var i = first; i < last; i++) {
+        var r = view[i];
+        html.push('<tr' + (cls[r] ? ' class="' + esc(cls[r]) + '"' : '') + '><td>' + rows[r].map(esc).join('</td><td>') + '</td></tr>');
+      }
+      html.push(pad((view.length - last) * rowH));
+      body.innerHTML = html.join('');
+      if (!measured && last > first) {
+        measured = true;
+        rowH = body.rows[1].getBoundingClientRect().height || rowH;
+        render();
+      }
+    }
+    function schedule() { if (!queued) { queued = true; requestAnimationFrame(render); } }
+    function refresh() {
+      var q = input.value.trim().toLowerCase();
+      if (q && !lower) lower = rows.map(function (r) { return r.join(' ').toLowerCase(); });
+      view = q ? order.filter(function (i) { return lower[i].indexOf(q) >= 0; }) : order;
+      count.textContent = view.length === rows.length ? rows.length + ' Zeilen' : view.length + ' von ' + rows.length + ' Zeilen';
+      scroll.scrollTop = 0;
+      render();
+    }
+    box.querySelectorAll('th').forEach(function (th, c) {
+      th.addEventListener('click', function () {
+        asc = sortCol === c ? !asc : true;
+        sortCol = c;
+        var keys = rows.map(function (r) { return key(r[c]); });
+        order = rows.map(function (_, i) { return i; }).sort(function (a, b) {
+          // Text cells (e.g. "–") stay behind the numbers in both directions
+          return keys[a][0] - keys[b][0] || (asc ? 1 : -1) * cmp(keys[a], keys[b]) || a - b;
+        });
+        box.querySelectorAll('th').forEach(function (h) { h.removeAttribute('data-sort'); });
+        th.setAttribute('data-sort', asc ? 'asc' : 'desc');
+        refresh();
+      });
+    });
+    input.addEventListener('input', refresh);
+    scroll.addEventListener('scroll', schedule);
+    window.addEventListener('resize', schedule);
+    refresh();
+  }
+  document.querySelectorAll('.vt').forEach(init);
+})();
+</script>"""
+
+
+# Section content: finished HTML or chunks produced on demand
+HtmlPart = Union[str, Iterable[str]]
+
+
+REPORT_STYLES = """
     <style>
       body { font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; margin: 24px; }
       h1 { font-size: 20px; margin-bottom: 8px; }
@@ -155,17 +270,59 @@ def export_html_page(
       .legend .ok { background: #e8f5e9; }
       .legend .warn { background: #fff8e1; }
       .legend .err { background: #ffebee; }
-      /* Stacked chart */
+      /* SVG charts (forecast.charts); project colours come with each chart */
       .chart { margin: 12px 0; }
-      .chart .row { display: flex; align-items: center; gap: 10px; margin: 6px 0; }
-      .chart .label { width: 90px; font-size: 12px; color: #333; }
-      .chart .bar { flex: 1; display: flex; height: 16px; background: #f1f1f1; border: 1px solid #e0e0e0; }
-      .chart .seg { height: 100%; position: relative; }
-      .chart .seg .lbl { position: absolute; left: 50%; transform: translateX(-50%); font-size: 10px; line-height: 16px; white-space: nowrap; }
+      .chart svg { display: block; max-width: 1200px; }
+      .chart text { font-size: 12px; fill: #333; }
+      .chart text.hd { font-weight: 600; }
+      .chart text.in, .chart text.in-dark { font-size: 10px; pointer-events: none; }
+      .chart text.in { fill: #fff; }
+      .chart .rest { fill: #cccccc; background: #cccccc; }
+      .chart .other { fill: #888888; background: #888888; }
+      .chart .other-a { fill: #dddddd; }
       .legend .swatch { display: inline-block; width: 10px; height: 10px; vertical-align: middle; margin-right: 6px; border: 1px solid #ddd; }
     </style>
     """
 
+
+def _html_section_parts(
+    title: str,
+    overview_items: List[tuple[str, str]],
+    vacations: List[str],
+    proj_summary_headers: List[str],
+    proj_summary_rows: Iterable[List[str]],
+    cap_headers: List[str],
+    cap_rows: Iterable[List[str]],
+    perday_headers: List[str],
+    perday_rows: Iterable[List[str]],
+    req_headers: List[str],
+    req_rows: Iterable[List[str]],
+    used_headers: List[str],
+    used_rows: Iterable[List[str]],
+    budget_headers: List[str],
+    budget_rows: Iterable[List[str]],
+    budget_row_classes: List[str] | None = None,
+    monthly_stack_chart_html: HtmlPart | None = None,
+    monthly_project_chart_html: HtmlPart | None = None,
+    team_headers: List[str] | None = None,
+    team_rows: List[List[str]] | None = None,
+    simulation_title: str | None = None,
+    simulation_headers: List[str] | None = None,
+    simulation_rows: List[List[str]] | None = None,
+    virtual_tables: bool = False,
+) -> List[Tuple[str, List[HtmlPart]]]:
+    """
+    Report body as (section id, parts) in page order. Tables are generators,
+    so nothing large is rendered before a part is consumed. With
+    `virtual_tables`, the project tables are embedded as JSON and drawn in
+    the browser (plus a final "vt-script" section with the script).
+    """
+
+    def project_table(sid: str, headers, rows, row_classes=None) -> Iterable[str]:
+        if virtual_tables:
+            return _iter_virtual_table(sid, headers, rows, row_classes)
+        return _iter_html_table(headers, rows, row_classes)
+
     # Overview as key-value table
     ov_rows = [[k, v] for (k, v) in overview_items]
     overview_html = _render_html_table(["Name", "Wert"], ov_rows).replace("<table>", "<table class=\"kv\">", 1)
@@ -174,57 +331,133 @@ def export_html_page(
         "<ul>" + "".join(f"<li>{_html_escape(v)}</li>" for v in vacations) + "</ul>"
     )
 
-    parts = [
+    sections: List[Tuple[str, List[HtmlPart]]] = [
+        ("title", [f"<h1>{_html_escape(title)}</h1>"]),
+        ("help", [
+            "<h2>Hilfe</h2>",
+            "<p class=\"desc\">Kurze Erläuterungen zu Begriffen und Berechnungen.</p>",
+            "<ul class=\"desc\">"
+            "<li><strong>Zuteilung (Kapazität)</strong>: Verfügbarkeit, die monatsweise per <em>weights_by_month</em> auf Projekte verteilt wird.</li>"
+            "<li><strong>Genutzt</strong>: Tatsächlich verwendete Stunden je Monat: min(Zuteilung, Monats-Limit, verbleibendes Budget).</li>"
+            "<li><strong>Ungenutzt</strong>: Zuteilung − Genutzt im Monat (verfällt für das Projekt).</li>"
+            "<li><strong>Ø/Tag (Zuteilung)</strong>: Zuteilung im Monat geteilt durch Arbeitstage des Projekts in diesem Monat.</li>"
+            "<li><strong>Erforderlicher Ø/Tag</strong>: Budget proportional zur Zuteilung auf Monate verteilt, dann durch Arbeitstage geteilt.</li>"
+            "<li><strong>Status</strong>: Grün = Budget exakt am Projektende verbraucht; Gelb = Restbudget bleibt; Rot = Budget vor Projektende erschöpft.</li>"
+            "</ul>",
+        ]),
+        ("overview", [
+            "<h2>Übersicht</h2>",
+            "<p class=\"desc\">Kompakte Kennzahlen zum Planungszeitraum: Arbeitstage, Gesamt-\nKapazität sowie Verteilung auf Projekte (zugewiesen/genutzt/ungenutzt)\nund Zahl der Projekte nach Status.</p>",
+            overview_html,
+        ]),
+        ("vacations", [
+            "<h2>Urlaube und Abwesenheiten</h2>",
+            "<p class=\"desc\">Auflistung aller hinterlegten Urlaubs- und Abwesenheitstage im\nPlanungszeitraum. Diese Tage reduzieren die verfügbaren Arbeitstage\nund damit die Kapazität.</p>",
+            vac_html,
+        ]),
+    ]
+    if team_rows:
+        sections += [("team", [
+            "<h2>Team – Kapazität je Person (h)</h2>",
+            "<p class=\"desc\">Monatliche Kapazität je Teammitglied (nach Urlaub, Overrides und Krankheit)\nsowie die Projekte, auf die sie verteilt wird. Die Zuteilungen aller Personen\nwerden je Projekt und Monat summiert.</p>",
+            _iter_html_table(team_headers or [], team_rows),
+        ])]
+    sections += [
+        ("projects", [
+            "<h2>Projekte – Zeitraum, Tage, Kapazität</h2>",
+            "<p class=\"desc\">Pro Projekt: aktiver Zeitraum, Anzahl Arbeitstage, gesamte zugewiesene\nKapazität, tatsächlich genutzte Stunden (unter Limits/Budget),\nungenutzte Stunden, verbleibendes Budget und erwartete Umsätze.</p>",
+            project_table("projects", proj_summary_headers, proj_summary_rows),
+        ]),
+        ("capacities", [
+            "<h2>Geplante Kapazitäten je Projekt</h2>",
+            "<p class=\"desc\">Zuteilung nach Monaten auf Basis der Gewichte (weights_by_month).\nDiese Werte zeigen die geplante Verfügbarkeit, noch ohne Limits/Budget.</p>",
+            project_table("capacities", cap_headers, cap_rows),
+        ]),
+        ("perday", [
+            "<h2>Verteilung Stunden pro Projekt (Øh/Arbeitstag im Monat)</h2>",
+            "<p class=\"desc\">Durchschnittliche tägliche Zuteilung im jeweiligen Monat:\nZuteilung (h) geteilt durch Arbeitstage des Projekts in diesem Monat.</p>",
+            project_table("perday", perday_headers, perday_rows),
+        ]),
+        ("required", [
+            "<h2>Erforderliche Øh/Arbeitstag je Monat (für 100%)</h2>",
+            "<p class=\"desc\">Notwendiger täglicher Durchschnitt, damit das Projektbudget bis zum\nProjektende aufgeht. Das Budget wird proportional zur Zuteilung auf\nMonate verteilt und durch die jeweiligen Arbeitstage geteilt.</p>",
+            project_table("required", req_headers, req_rows),
+        ]),
+        ("used", [
+            "<h2>Genutzte Stunden je Projekt (Monat)</h2>",
+            "<p class=\"desc\">Reale Nutzung je Monat unter Berücksichtigung von Monats-Limits und\nRestbudget: min(Zuteilung, Limit, verbleibendes Budget).</p>",
+            project_table("used", used_headers, used_rows),
+        ]),
+        ("chart-months", [
+            "<h2>Kapazitätsnutzung je Monat (gestapelt)</h2>",
+            "<p class=\"desc\">Gesamtkapazität pro Monat mit den genutzten Anteilen je Projekt und dem verbleibenden Rest (nicht genutzt/zugewiesen).</p>",
+            (monthly_stack_chart_html or '<p class="muted">Keine Daten</p>'),
+        ]),
+        ("chart-projects", [
+            "<h2>Projekt‑Kapazität je Monat (genutzt vs. verfügbar)</h2>",
+            "<p class=\"desc\">Für jeden Monat/Projekt: Anteil der genutzten Stunden im Verhältnis zum Restbudget, das zu Monatsbeginn verfügbar ist (sequentieller Verbrauch des Projektbudgets).</p>",
+            (monthly_project_chart_html or '<p class="muted">Keine Daten</p>'),
+        ]),
+        ("budget", [
+            "<h2>Budgetverbrauch pro Projekt (h)</h2>",
+            "<p class=\"desc\">Monatlicher Budget-Burn. Status: Grün = Budget exakt am Projektende\nverbraucht; Gelb = Restbudget bleibt; Rot = Budget vor Projektende\nerreicht 0.</p>",
+            "<div class=\"legend\"><span class=\"ok\">Grün: passt genau</span><span class=\"warn\">Gelb: Budget nicht voll verbraucht</span><span class=\"err\">Rot: Budget vor Projektende erschöpft</span></div>",
+            project_table("budget", budget_headers, budget_rows, budget_row_classes or []),
+        ]),
+    ]
+    if simulation_rows:
+        sections += [("simulation", [
+            f"<h2>{_html_escape(simulation_title or 'Simulation')}</h2>",
+            "<p class=\"desc\">Monte-Carlo-Simulation der Krankheit: Je Lauf fällt jeder Arbeitstag einer Person mit\n<em>prob_per_workday</em> komplett aus. Perzentile (P10/P50/P90) über alle Läufe; Anteile der\nLäufe je Budgetstatus; Monat, bis zu dem das Budget in 50%/90% der Läufe erschöpft ist.</p>",
+            _iter_html_table(simulation_headers or [], simulation_rows),
+        ])]
+    if virtual_tables:
+        sections += [("vt-script", [VIRTUAL_TABLE_SCRIPT])]
+    return sections
+
+
+def _join_part(part: HtmlPart) -> str:
+    return part if isinstance(part, str) else "".join(part)
+
+
+def export_html_sections(title: str, **kwargs) -> List[Tuple[str, str]]:
+    """
+    Report body as (section id, HTML) in page order; the live server patches
+    sections by id. Keyword arguments as for `_html_section_parts`.
+    """
+    return [(sid, "\n".join(_join_part(p) for p in parts)) for sid, parts in _html_section_parts(title, **kwargs)]
+
+
+def html_head(title: str) -> str:
+    """Document start up to and including <body>."""
+    return "\n".join([
         "<!DOCTYPE html>",
         "<html lang=\"de\">",
         "<head>",
         "<meta charset=\"utf-8\">",
         f"<title>{_html_escape(title)}</title>",
-        styles,
+        REPORT_STYLES,
         "</head>",
         "<body>",
-        f"<h1>{_html_escape(title)}</h1>",
-        "<h2>Hilfe</h2>",
-        "<p class=\"desc\">Kurze Erläuterungen zu Begriffen und Berechnungen.</p>",
-        "<ul class=\"desc\">"
-        "<li><strong>Zuteilung (Kapazität)</strong>: Verfügbarkeit, die monatsweise per <em>weights_by_month</em> auf Projekte verteilt wird.</li>"
-        "<li><strong>Genutzt</strong>: Tatsächlich verwendete Stunden je Monat: min(Zuteilung, Monats-Limit, verbleibendes Budget).</li>"
-        "<li><strong>Ungenutzt</strong>: Zuteilung − Genutzt im Monat (verfällt für das Projekt).</li>"
-        "<li><strong>Ø/Tag (Zuteilung)</strong>: Zuteilung im Monat geteilt durch Arbeitstage des Projekts in diesem Monat.</li>"
-        "<li><strong>Erforderlicher Ø/Tag</strong>: Budget proportional zur Zuteilung auf Monate verteilt, dann durch Arbeitstage geteilt.</li>"
-        "<li><strong>Status</strong>: Grün = Budget exakt am Projektende verbraucht; Gelb = Restbudget bleibt; Rot = Budget vor Projektende erschöpft.</li>"
-        "</ul>",
-        "<h2>Übersicht</h2>",
-        "<p class=\"desc\">Kompakte Kennzahlen zum Planungszeitraum: Arbeitstage, Gesamt-\nKapazität sowie Verteilung auf Projekte (zugewiesen/genutzt/ungenutzt)\nund Zahl der Projekte nach Status.</p>",
-        overview_html,
-        "<h2>Urlaube und Abwesenheiten</h2>",
-        "<p class=\"desc\">Auflistung aller hinterlegten Urlaubs- und Abwesenheitstage im\nPlanungszeitraum. Diese Tage reduzieren die verfügbaren Arbeitstage\nund damit die Kapazität.</p>",
-        vac_html,
-        "<h2>Projekte – Zeitraum, Tage, Kapazität</h2>",
-        "<p class=\"desc\">Pro Projekt: aktiver Zeitraum, Anzahl Arbeitstage, gesamte zugewiesene\nKapazität, tatsächlich genutzte Stunden (unter Limits/Budget),\nungenutzte Stunden, verbleibendes Budget und erwartete Umsätze.</p>",
-        _render_html_table(proj_summary_headers, proj_summary_rows),
-        "<h2>Geplante Kapazitäten je Projekt</h2>",
-        "<p class=\"desc\">Zuteilung nach Monaten auf Basis der Gewichte (weights_by_month).\nDiese Werte zeigen die geplante Verfügbarkeit, noch ohne Limits/Budget.</p>",
-        _render_html_table(cap_headers, cap_rows),
-        "<h2>Verteilung Stunden pro Projekt (Øh/Arbeitstag im Monat)</h2>",
-        "<p class=\"desc\">Durchschnittliche tägliche Zuteilung im jeweiligen Monat:\nZuteilung (h) geteilt durch Arbeitstage des Projekts in diesem Monat.</p>",
-        _render_html_table(perday_headers, perday_rows),
-        "<h2>Erforderliche Øh/Arbeitstag je Monat (für 100%)</h2>",
-        "<p class=\"desc\">Notwendiger täglicher Durchschnitt, damit das Projektbudget bis zum\nProjektende aufgeht. Das Budget wird proportional zur Zuteilung auf\nMonate verteilt und durch die jeweiligen Arbeitstage geteilt.</p>",
-        _render_html_table(req_headers, req_rows),
-        "<h2>Genutzte Stunden je Projekt (Monat)</h2>",
-        "<p class=\"desc\">Reale Nutzung je Monat unter Berücksichtigung von Monats-Limits und\nRestbudget: min(Zuteilung, Limit, verbleibendes Budget).</p>",
-        _render_html_table(used_headers, used_rows),
-        "<h2>Kapazitätsnutzung je Monat (gestapelt)</h2>",
-        "<p class=\"desc\">Gesamtkapazität pro Monat mit den genutzten Anteilen je Projekt und dem verbleibenden Rest (nicht genutzt/zugewiesen).</p>",
-        (monthly_stack_chart_html or '<p class="muted">Keine Daten</p>'),
-        "<h2>Projekt‑Kapazität je Monat (genutzt vs. verfügbar)</h2>",
-        "<p class=\"desc\">Für jeden Monat/Projekt: Anteil der genutzten Stunden im Verhältnis zum Restbudget, das zu Monatsbeginn verfügbar ist (sequentieller Verbrauch des Projektbudgets).</p>",
-        (monthly_project_chart_html or '<p class="muted">Keine Daten</p>'),
-        "<h2>Budgetverbrauch pro Projekt (h)</h2>",
-        "<p class=\"desc\">Monatlicher Budget-Burn. Status: Grün = Budget exakt am Projektende\nverbraucht; Gelb = Restbudget bleibt; Rot = Budget vor Projektende\nerreicht 0.</p>",
-        "<div class=\"legend\"><span class=\"ok\">Grün: passt genau</span><span class=\"warn\">Gelb: Budget nicht voll verbraucht</span><span class=\"err\">Rot: Budget vor Projektende erschöpft</span></div>",
-        _render_html_table(budget_headers, budget_rows, row_classes=budget_row_classes or []),
-        "</body></html>",
-    ]
-    return "\n".join(parts)
+    ])
+
+
+def iter_html_page(title: str, **kwargs) -> Iterator[str]:
+    """
+    Complete report page in chunks (at most one table row or chart row
+    each), for writing to a file or socket while rendering.
+    """
+    yield html_head(title)
+    for _, parts in _html_section_parts(title, **kwargs):
+        for part in parts:
+            yield "\n"
+            if isinstance(part, str):
+                yield part
+            else:
+                yield from part
+    yield "\n</body></html>"
+
+
+def export_html_page(title: str, **kwargs) -> str:
+    """Complete report page; keyword arguments as for `export_html_sections`."""
+    return "".join(iter_html_page(title, **kwargs))
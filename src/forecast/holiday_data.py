@@ -0,0 +1,101 @@
+"""
+Bundled holiday dataset: per state and year a bitmap over the days of the
+year (bit i = day i of the year, 0-based). Generated by
+`scripts/build_holiday_data.py` and loaded lazily on first use.
+
+File layout (zlib-compressed):
+  magic b"FHD1" | first_year u16 | n_years u16 | n_states u8 | n_states × 2-byte state code
+  | n_states × n_years × 46-byte bitmap
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, List, Tuple
+import os
+import struct
+import zlib
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "holidays_de.bin")
+
+MAGIC = b"FHD1"
+BITMAP_BYTES = 46  # 366 bits
+STATES = ["BB", "BE", "BW", "BY", "HB", "HE", "HH", "MV", "NI", "NW", "RP", "SH", "SL", "SN", "ST", "TH"]
+
+
+class HolidayTable:
+    def __init__(self, first_year: int, n_years: int, states: List[str], bitmaps: bytes):
+        self.first_year = first_year
+        self.last_year = first_year + n_years - 1
+        self._n_years = n_years
+        self._state_index = {s: i for i, s in enumerate(states)}
+        self._bitmaps = bitmaps
+
+    def covers(self, state: str, year: int) -> bool:
+        return state in self._state_index and self.first_year <= year <= self.last_year
+
+    def _bitmap(self, state: str, year: int) -> bytes:
+        off = (self._state_index[state] * self._n_years + (year - self.first_year)) * BITMAP_BYTES
+        return self._bitmaps[off:off + BITMAP_BYTES]
+
+    def is_holiday(self, state: str, d: date) -> bool:
+        if not self.covers(state, d.year):
+            return False
+        i = d.timetuple().tm_yday - 1
+        off = (self._state_index[state] * self._n_years + (d.year - self.first_year)) * BITMAP_BYTES
+        return bool(self._bitmaps[off + (i >> 3)] & (1 << (i & 7)))
+
+    def holidays(self, state: str, year: int) -> FrozenSet[date]:
+        bm = self._bitmap(state, year)
+        jan1 = date(year, 1, 1)
+        found = []
+        for byte_idx, b in enumerate(bm):
+            if not b:
+                continue
+            for bit in range(8):
+                if b & (1 << bit):
+                    found.append(jan1 + timedelta(days=byte_idx * 8 + bit))
+        return frozenset(found)
+
+
+def encode(first_year: int, last_year: int, holidays_by_state: Dict[str, Dict[int, List[date]]]) -> bytes:
+    states = [s for s in STATES if s in holidays_by_state]
+    n_years = last_year - first_year + 1
+    out = bytearray(MAGIC)
+    out += struct.pack("<HHB", first_year, n_years, len(states))
+    for s in states:
+        out += s.encode("ascii")
+    for s in states:
+        for y in range(first_year, last_year + 1):
+            bm = bytearray(BITMAP_BYTES)
+            for d in holidays_by_state[s].get(y, []):
+                i = d.timetuple().tm_yday - 1
+                bm[i >> 3] |= 1 << (i & 7)
+            out += bm
+    return zlib.compress(bytes(out), 9)
+
+
+def decode(blob: bytes) -> HolidayTable:
+    raw = zlib.decompress(blob)
+    if raw[:4] != MAGIC:
+        raise ValueError("Ungültige Feiertagsdaten (Magic)")
+    first_year, n_years, n_states = struct.unpack_from("<HHB", raw, 4)
+    pos = 4 + struct.calcsize("<HHB")
+    states = [raw[pos + 2 * i:pos + 2 * i + 2].decode("ascii") for i in range(n_states)]
+    pos += 2 * n_states
+    return HolidayTable(first_year, n_years, states, raw[pos:])
+
+
+_table: Tuple[HolidayTable | None] | None = None
+
+
+def load_table() -> HolidayTable | None:
+    """Load the bundled table once; None if the data file is missing or unreadable."""
+    global _table
+    if _table is None:
+        try:
+            with open(DATA_PATH, "rb") as f:
+                _table = (decode(f.read()),)
+        except (OSError, ValueError, zlib.error, struct.error):
+            _table = (None,)
+    return _table[0]
@@ -0,0 +1,157 @@
+"""
+Minimal Prometheus-style metrics (text exposition format 0.0.4) for the
+live server, plus stage timing for plan builds and renders.
+
+Stage timing is off unless a caller opened a collection with
+`collect_stages()`; `Lap` then costs one clock read per stage.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds: 1 ms … 10 s
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes: 1 KiB … 16 MiB
+SIZE_BUCKETS = tuple(float(1024 * 4 ** i) for i in range(8))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(x: float) -> str:
+    if x == float("inf"):
+        return "+Inf"
+    return repr(float(x)) if not float(x).is_integer() else str(int(x))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, v in sorted(self.values().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_num(v)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = TIME_BUCKETS, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        # Per label tuple: [count per bucket (last = +Inf)], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            s[0][i] += 1
+            s[1][0] += value
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        for labels, (counts, total) in items:
+            acc = 0
+            for le, c in zip(self.buckets + (float("inf"),), counts):
+                acc += c
+                le_label = 'le="' + _num(le) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le_label)} {acc}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {acc}")
+        return lines
+
+
+class Gauge:
+    """Value read at scrape time from `fn` (label tuple -> value)."""
+
+    def __init__(self, name: str, help: str, fn, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, v in sorted(self.fn().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_num(v)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def expose(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.expose())
+        return "\n".join(lines) + "\n"
+
+
+# Stage durations of the current thread's collection (None = not collecting)
+_local = threading.local()
+
+
+def collect_stages() -> Dict[str, float]:
+    """Start collecting stage durations in this thread; returns the dict that fills up."""
+    _local.stages = {}
+    return _local.stages
+
+
+def end_stages() -> Optional[Dict[str, float]]:
+    stages = getattr(_local, "stages", None)
+    _local.stages = None
+    return stages
+
+
+class Lap:
+    """`lap("weights")` adds the time since the previous lap to that stage."""
+
+    __slots__ = ("stages", "t")
+
+    def __init__(self):
+        self.stages = getattr(_local, "stages", None)
+        self.t = time.perf_counter() if self.stages is not None else 0.0
+
+    def __call__(self, stage: str) -> None:
+        if self.stages is None:
+            return
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self.t)
+        self.t = now
@@ -1,26 +1,415 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 import json
+import multiprocessing
 import os
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from urllib.parse import urlparse
-from typing import Optional
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
 
-import yaml
+from .compress import MIN_SIZE, compress, env_level, negotiate
+from .config import Config, load_yaml, parse_config
+from .engine import PlanModel, update_plan
+from .export import iter_plan_json
+from .formatting import html_head
+from .metrics import SIZE_BUCKETS, Counter, Gauge, Histogram, Lap, Registry, collect_stages, end_stages
+from .report import REPORT_TITLE, create_html_report, create_html_sections
 
-from .config import Config, Settings, CapacityConfig, CalendarConfig, SicknessConfig, Project
-from .report import create_html_report
+# Preloaded into the editor and, in watch mode, watched for external edits
+CONFIG_PATH = os.path.join("config", "config.yml")
 
+# Last (YAML text, config, plan) per browser session for incremental recomputation
+MAX_SESSIONS = 32
+_sessions: "OrderedDict[str, Tuple[str, Config, PlanModel]]" = OrderedDict()
+_sessions_lock = threading.Lock()
 
-def _config_from_dict(data: dict) -> Config:
-    settings = Settings.from_dict(data.get("settings") or {})
-    capacity = CapacityConfig.from_dict(data.get("capacity") or {})
-    calendar = CalendarConfig.from_dict(data.get("calendar") or {})
-    sickness = SicknessConfig.from_dict(data.get("sickness") or {})
-    projects = [Project.from_dict(x) for x in (data.get("projects") or [])]
-    if not projects:
-        raise ValueError("Mindestens ein Projekt muss in projects definiert sein")
-    return Config(settings=settings, capacity=capacity, calendar=calendar, sickness=sickness, projects=projects)
+# Abort signals for running jobs: shared value of a worker process (id of the
+# job to abandon) or, for in-thread rendering, a set of job ids
+_abort_value = None
+_aborted_jobs: Set[int] = set()
+
+
+class Superseded(Exception):
+    """A newer revision from the same editor arrived; this render is dropped."""
+
+
+def _init_worker(abort_value) -> None:
+    global _abort_value
+    _abort_value = abort_value
+
+
+def _check_abort(job_id: int) -> None:
+    if job_id and (job_id in _aborted_jobs or (_abort_value is not None and _abort_value.value == job_id)):
+        raise Superseded()
+
+
+def render_session(session_id: str, raw: str, job_id: int = 0, kind: str = "html"):
+    """
+    Render `raw` as `kind`: "html" (report page), "sections" ((section id,
+    HTML) pairs) or "json" (plan document); the plan is updated incrementally from the session's
+    previous config (unchanged text reuses the plan as is).
+    Between stages the job checks whether it was superseded.
+    """
+    with _sessions_lock:
+        prev = _sessions.get(session_id) if session_id else None
+    if prev is not None and prev[0] == raw:
+        _, cfg, plan = prev
+    else:
+        lap = Lap()
+        cfg = parse_config(load_yaml(raw))
+        lap("parse")
+        _check_abort(job_id)
+        plan = update_plan(prev[1] if prev else None, prev[2] if prev else None, cfg)
+    if session_id:
+        # Keep the plan even if aborted below: the next revision builds on it
+        with _sessions_lock:
+            _sessions[session_id] = (raw, cfg, plan)
+            _sessions.move_to_end(session_id)
+            while len(_sessions) > MAX_SESSIONS:
+                _sessions.popitem(last=False)
+    _check_abort(job_id)
+    lap = Lap()
+    if kind == "sections":
+        out = create_html_sections(cfg, plan)
+    elif kind == "json":
+        out = "".join(iter_plan_json(plan))
+    else:
+        out = create_html_report(cfg, plan)
+    lap("render")
+    return out
+
+
+def _render_job(session_id: str, raw: str, job_id: int, kind: str):
+    """`render_session` with stage timing: (result, seconds per stage)."""
+    stages = collect_stages()
+    try:
+        return render_session(session_id, raw, job_id, kind), stages
+    finally:
+        end_stages()
+
+
+def normalize_yaml(raw: str) -> str:
+    """Line endings and trailing whitespace do not change the report."""
+    return "\n".join(line.rstrip() for line in raw.replace("\r\n", "\n").replace("\r", "\n").split("\n")).strip("\n")
+
+
+def render_key(raw: str) -> str:
+    # The day is part of the key: defaults and "today" depend on it
+    h = hashlib.sha256(normalize_yaml(raw).encode("utf-8"))
+    h.update(date.today().isoformat().encode("ascii"))
+    return h.hexdigest()[:32]
+
+
+def _cache_kind(key: str) -> str:
+    if "|" in key:
+        return "compressed"
+    return {"s:": "sections", "j:": "json"}.get(key[:2], "html")
+
+
+class RenderCache:
+    """LRU of rendered reports (UTF-8 bytes) by render key, bounded by total size."""
+
+    def __init__(self, max_bytes: int, lookups: Optional[Counter] = None):
+        self.max_bytes = max_bytes
+        self.lookups = lookups
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Tuple[int, int]:
+        """(entries, bytes)"""
+        with self._lock:
+            return len(self._items), self._size
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+        if self.lookups is not None:
+            self.lookups.inc(_cache_kind(key), "miss" if body is None else "hit")
+        return body
+
+    def put(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+
+class _Subscriber:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.latest: Optional[List[Tuple[str, str]]] = None
+        self.version = 0
+        # Editor revision of `latest`; older ones arriving late are ignored
+        self.revision = 0
+        # Config file content saved outside the browser (watch mode)
+        self.file_text: Optional[str] = None
+        self.file_version = 0
+        self.closed = False
+
+
+class EventHub:
+    """
+    Server-Sent Events per session. A render publishes its sections; the
+    stream sends only sections whose content hash differs from what the
+    client already has. Diffs are made at send time, so a burst of renders
+    collapses into one update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, _Subscriber] = {}
+
+    def connected(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._subscribers
+
+    def publish(self, session_id: str, sections: List[Tuple[str, str]], revision: int = 0) -> bool:
+        with self._lock:
+            sub = self._subscribers.get(session_id)
+        if sub is None:
+            return False
+        with sub.cond:
+            if revision and revision < sub.revision:
+                return True
+            sub.revision = max(sub.revision, revision)
+            sub.latest = sections
+            sub.version += 1
+            sub.cond.notify_all()
+        return True
+
+    def broadcast_file(self, text: str) -> int:
+        """Send the changed config file to all open streams; returns their number."""
+        with self._lock:
+            subs = list(self._subscribers.values())
+        for sub in subs:
+            with sub.cond:
+                sub.file_text = text
+                sub.file_version += 1
+                sub.cond.notify_all()
+        return len(subs)
+
+    def stream(self, session_id: str, write, keepalive: float = 15.0) -> None:
+        """Send events via `write(bytes)` until the client disconnects or a newer stream replaces this one."""
+        sub = _Subscriber()
+        with self._lock:
+            old = self._subscribers.get(session_id)
+            self._subscribers[session_id] = sub
+        if old is not None:
+            with old.cond:
+                old.closed = True
+                old.cond.notify_all()
+        sent: Dict[str, str] = {}
+        seen = 0
+        file_seen = 0
+        try:
+            write(b"retry: 2000\n\n")
+            while True:
+                with sub.cond:
+                    sub.cond.wait_for(
+                        lambda: sub.closed or sub.version != seen or sub.file_version != file_seen, timeout=keepalive
+                    )
+                    if sub.closed:
+                        return
+                    file_text = None
+                    if sub.file_version != file_seen:
+                        file_text, file_seen = sub.file_text, sub.file_version
+                    if sub.version == seen:
+                        latest = None
+                    else:
+                        latest, seen = sub.latest, sub.version
+                if file_text is not None:
+                    # The editor takes the new text and renders it like a local edit
+                    write(b"event: config\ndata: " + json.dumps(file_text, ensure_ascii=False).encode("utf-8") + b"\n\n")
+                if latest is None:
+                    if file_text is None:
+                        write(b": ping\n\n")
+                    continue
+                hashes = {sid: hashlib.sha1(html.encode("utf-8")).hexdigest() for sid, html in latest}
+                payload = {
+                    "order": [sid for sid, _ in latest],
+                    "changed": {sid: html for sid, html in latest if sent.get(sid) != hashes[sid]},
+                }
+                if not sent:
+                    payload["head"] = html_head(REPORT_TITLE)
+                sent = hashes
+                write(b"event: sections\ndata: " + json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        finally:
+            with self._lock:
+                if self._subscribers.get(session_id) is sub:
+                    del self._subscribers[session_id]
+
+
+class ServerBusy(Exception):
+    pass
+
+
+class RenderPool:
+    """
+    Bounded pool of render worker processes. Each worker is a single-process
+    executor with its own session store; a session always goes to the same
+    worker so incremental recomputation keeps working. At most `queue_limit`
+    renders may be running or waiting, further ones raise ServerBusy.
+    With workers=0 renders run in the request thread.
+
+    Requests carry a revision per session; a newer revision cancels the
+    session's queued render and signals a running one to stop at its next
+    stage, and results that became stale are dropped (Superseded).
+    """
+
+    def __init__(self, workers: int, queue_limit: int, stage_seconds: Optional[Histogram] = None):
+        self.workers = workers
+        self.stage_seconds = stage_seconds
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * workers
+        self._abort_values = [multiprocessing.Value("q", 0) for _ in range(workers)]
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, queue_limit))
+        self._job_ids = itertools.count(1)
+        # Per session: latest revision seen and the job currently queued/running
+        self._latest: "OrderedDict[str, int]" = OrderedDict()
+        self._jobs: Dict[str, Tuple[int, Optional[Future]]] = {}
+
+    def _executor(self, i: int) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executors[i] is None:
+                self._executors[i] = ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(self._abort_values[i],))
+            return self._executors[i]
+
+    def _worker_index(self, session_id: str) -> int:
+        return zlib.crc32(session_id.encode("utf-8")) % self.workers
+
+    def _supersede(self, session_id: str, revision: int) -> None:
+        """Register `revision` as the latest of the session and stop older work."""
+        with self._lock:
+            if revision < self._latest.get(session_id, 0):
+                raise Superseded()
+            self._latest[session_id] = revision
+            self._latest.move_to_end(session_id)
+            while len(self._latest) > 4 * MAX_SESSIONS:
+                self._latest.popitem(last=False)
+            job = self._jobs.pop(session_id, None)
+        if job is None:
+            return
+        job_id, fut = job
+        if fut is None:
+            _aborted_jobs.add(job_id)
+        elif not fut.cancel():
+            self._abort_values[self._worker_index(session_id)].value = job_id
+
+    def register(self, session_id: str, revision: int) -> None:
+        """
+        Record a request's revision before it is answered, also from a cache
+        or ETag hit: older renders of the session still running are stopped
+        and their results dropped. Raises Superseded if a newer one is known.
+        """
+        if session_id and revision:
+            self._supersede(session_id, revision)
+
+    def is_stale(self, session_id: str, revision: int) -> bool:
+        with self._lock:
+            return revision < self._latest.get(session_id, 0)
+
+    def render(self, session_id: str, raw: str, revision: int = 0, kind: str = "html"):
+        self.register(session_id, revision)
+        if not self._slots.acquire(blocking=False):
+            raise ServerBusy()
+        job_id = next(self._job_ids) if session_id and revision else 0
+        try:
+            if not self.workers:
+                if job_id:
+                    with self._lock:
+                        self._jobs[session_id] = (job_id, None)
+                try:
+                    html, stages = _render_job(session_id, raw, job_id, kind)
+                finally:
+                    _aborted_jobs.discard(job_id)
+            else:
+                i = self._worker_index(session_id)
+                fut = self._executor(i).submit(_render_job, session_id, raw, job_id, kind)
+                if job_id:
+                    with self._lock:
+                        self._jobs[session_id] = (job_id, fut)
+                try:
+                    html, stages = fut.result()
+                except CancelledError:
+                    raise Superseded()
+                except BrokenProcessPool:
+                    # Worker died (e.g. out of memory): replace it, the session starts over
+                    with self._lock:
+                        self._executors[i] = None
+                    raise
+            if self.stage_seconds is not None:
+                for stage, seconds in stages.items():
+                    self.stage_seconds.observe(seconds, stage)
+            # Discard before serialization if a newer revision arrived meanwhile
+            if job_id and self.is_stale(session_id, revision):
+                raise Superseded()
+            return html
+        finally:
+            if job_id:
+                with self._lock:
+                    if self._jobs.get(session_id, (None,))[0] == job_id:
+                        del self._jobs[session_id]
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for ex in self._executors:
+                if ex is not None:
+                    ex.shutdown(wait=False, cancel_futures=True)
+            self._executors = [None] * self.workers
+
+
+# Routes with their own label in request metrics; everything else is "other"
+ROUTES = ("/", "/render", "/events", "/api/plan", "/metrics")
+
+
+class ServerMetrics:
+    """Metrics of one server process, exposed at /metrics."""
+
+    def __init__(self):
+        self.registry = Registry()
+        reg = self.registry.register
+        self.requests = reg(Counter("forecast_http_requests_total", "HTTP-Anfragen nach Pfad und Status", ("path", "code")))
+        self.duration = reg(Histogram("forecast_http_request_duration_seconds", "Antwortzeit bis zum Senden des Bodys", labelnames=("path",)))
+        self.response_size = reg(Histogram("forecast_http_response_size_bytes", "Gesendete Body-Größe (nach Kompression)", SIZE_BUCKETS, ("path",)))
+        self.stage_seconds = reg(Histogram("forecast_render_stage_seconds", "Dauer je Stufe eines Renderings (parse, calendar, capacity, projects, weights, compute, usage, simulation, render)", labelnames=("stage",)))
+        self.cache_lookups = reg(Counter("forecast_render_cache_lookups_total", "Zugriffe auf den Render-Cache nach Art und Ergebnis", ("kind", "result")))
+        reg(Gauge("forecast_render_cache_hit_ratio", "Anteil der Cache-Treffer je Art seit dem Start", self._hit_ratio, ("kind",)))
+        self.cache: Optional[RenderCache] = None
+        reg(Gauge("forecast_render_cache_entries", "Einträge im Render-Cache", lambda: {(): self.cache.stats()[0]} if self.cache else {}))
+        reg(Gauge("forecast_render_cache_bytes", "Belegte Bytes im Render-Cache", lambda: {(): self.cache.stats()[1]} if self.cache else {}))
+
+    def _hit_ratio(self) -> Dict[Tuple[str, ...], float]:
+        totals: Dict[str, List[float]] = {}
+        for (kind, result), n in self.cache_lookups.values().items():
+            t = totals.setdefault(kind, [0.0, 0.0])
+            t[0 if result == "hit" else 1] += n
+        return {(kind,): hit / (hit + miss) for kind, (hit, miss) in totals.items() if hit + miss}
+
+    def observe_request(self, path: str, code: int, size: int, seconds: float) -> None:
+        route = path if path in ROUTES else "other"
+        self.requests.inc(route, str(code))
+        self.duration.observe(seconds, route)
+        self.response_size.observe(size, route)
 
 
 INDEX_HTML = r"""<!DOCTYPE html>
@@ -51,6 +440,14 @@ INDEX_HTML = r"""<!DOCTYPE html>
   </style>
   <script>
     let timer = null;
+    let lastEtag = null;
+    let revision = 0;  // increases per request; the server drops superseded renders
+    let push = null;  // open event stream: the server sends changed report sections only
+    let shellReady = Promise.resolve();
+    let fileText = null;  // config file content the editor was loaded from
+    // Per-tab id: the server keeps the last plan per session and recomputes incrementally
+    const sessionId = sessionStorage.getItem('forecastSession') || (Date.now().toString(36) + Math.random().toString(36).slice(2));
+    sessionStorage.setItem('forecastSession', sessionId);
     function clampSplit(p) { return Math.max(20, Math.min(80, p)); }
     function setSplit(pct) {
       const root = document.documentElement;
@@ -58,16 +455,79 @@ INDEX_HTML = r"""<!DOCTYPE html>
       root.style.setProperty('--left', val);
       localStorage.setItem('splitLeft', val);
     }
+    // Patch pushed sections into the report document in place
+    function applySections(p) {
+      const out = document.getElementById('out');
+      if (p.head) {
+        shellReady = new Promise((resolve) => { out.onload = () => resolve(); });
+        out.srcdoc = p.head + '</body></html>';
+      }
+      shellReady.then(() => {
+        const doc = out.contentDocument;
+        if (!doc || !doc.body) return;
+        const keep = new Set(p.order);
+        for (const el of Array.from(doc.body.children)) {
+          if (!el.dataset.sec || !keep.has(el.dataset.sec)) el.remove();
+        }
+        let prev = null;
+        for (const id of p.order) {
+          let el = doc.getElementById('sec-' + id);
+          if (!el) { el = doc.createElement('section'); el.id = 'sec-' + id; el.dataset.sec = id; }
+          if (id in p.changed) el.innerHTML = p.changed[id];
+          const ref = prev ? prev.nextSibling : doc.body.firstChild;
+          if (el !== ref) doc.body.insertBefore(el, ref);
+          prev = el;
+        }
+      });
+    }
+    function connectPush() {
+      const es = new EventSource('/events?session=' + encodeURIComponent(sessionId));
+      es.addEventListener('open', () => {
+        // New stream: the server sends all sections on the next render
+        push = es;
+        lastEtag = null;
+        renderNow();
+      });
+      es.addEventListener('error', () => { push = null; });  // EventSource reconnects by itself
+      es.addEventListener('sections', (ev) => applySections(JSON.parse(ev.data)));
+      es.addEventListener('config', (ev) => {
+        // config.yml was saved elsewhere: take it over unless there are local edits
+        const ta = document.getElementById('yaml');
+        const text = JSON.parse(ev.data);
+        if (ta.value !== fileText) {
+          document.getElementById('err').textContent = 'config.yml wurde extern geändert; lokale Änderungen bleiben erhalten (Seite neu laden, um sie zu verwerfen).';
+          return;
+        }
+        ta.value = text;
+        fileText = ta.value;
+        if (timer) clearTimeout(timer);
+        renderNow();
+      });
+    }
     // No syntax highlighting to ensure broad compatibility
     async function renderNow() {
+      timer = null;
       const ta = document.getElementById('yaml');
       const out = document.getElementById('out');
       const err = document.getElementById('err');
       err.textContent = '';
       try {
-        const res = await fetch('/render', { method: 'POST', headers: { 'Content-Type': 'text/plain' }, body: ta.value });
+        const rev = ++revision;
+        const headers = { 'Content-Type': 'text/plain', 'X-Forecast-Session': sessionId, 'X-Forecast-Revision': String(rev) };
+        if (lastEtag) headers['If-None-Match'] = lastEtag;
+        if (push) headers['X-Forecast-Push'] = '1';
+        const res = await fetch('/render', { method: 'POST', headers, body: ta.value });
+        if (rev !== revision) return;  // a newer request is on its way
+        if (res.status === 304 || res.status === 204) return;  // unchanged or superseded
+        if (res.status === 202) { lastEtag = res.headers.get('ETag'); return; }  // sections arrive via the event stream
+        if (res.status === 503) {
+          // Server busy: retry shortly unless a newer edit already scheduled a render
+          if (!timer) timer = setTimeout(renderNow, 1000);
+          return;
+        }
         const text = await res.text();
         if (res.ok) {
+          lastEtag = res.headers.get('ETag');
           out.srcdoc = text;
         } else {
           err.textContent = text;
@@ -86,6 +546,7 @@ INDEX_HTML = r"""<!DOCTYPE html>
       root.style.setProperty('--left', saved || '35%');
 
       const ta = document.getElementById('yaml');
+      fileText = ta.value;
       ta.addEventListener('input', onInput);
       document.getElementById('btn').addEventListener('click', renderNow);
       const reset = document.getElementById('reset'); if (reset) reset.addEventListener('click', () => setSplit(35));
@@ -129,7 +590,13 @@ INDEX_HTML = r"""<!DOCTYPE html>
         if (e.key === 'ArrowRight') { setSplit(cur + 1); e.preventDefault(); }
       });
 
-      renderNow();
+      if (window.EventSource) {
+        connectPush();
+        // Fallback to full renders if the event stream does not come up
+        setTimeout(() => { if (!push) renderNow(); }, 1500);
+      } else {
+        renderNow();
+      }
     });
   </script>
 </head>
@@ -160,53 +627,195 @@ INDEX_HTML = r"""<!DOCTYPE html>
 
 
 class Handler(BaseHTTPRequestHandler):
-    def _send(self, code: int, body: str, content_type: str = "text/html; charset=utf-8"):
+    _started = 0.0
+
+    def _send(self, code: int, body, content_type: str = "text/html; charset=utf-8", headers: Optional[dict] = None, cache_key: Optional[str] = None):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        # Compress per Accept-Encoding; with `cache_key` the compressed body is cached too
+        enc = negotiate(self.headers.get("Accept-Encoding", "")) if code == 200 and len(data) >= MIN_SIZE else None
+        if enc:
+            zkey = f"{cache_key}|{enc}" if cache_key else None
+            zdata = self.server.render_cache.get(zkey) if zkey else None
+            if zdata is None:
+                zdata = compress(data, enc, self.server.compress_level)
+                if zkey:
+                    self.server.render_cache.put(zkey, zdata)
+            data = zdata
         self.send_response(code)
         self.send_header("Content-Type", content_type)
         self.send_header("Cache-Control", "no-cache")
+        # A 304 repeats the Vary of the 200 it validates
+        if code in (200, 304):
+            self.send_header("Vary", "Accept-Encoding")
+        if enc:
+            self.send_header("Content-Encoding", enc)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        # 204/304 have no body and must not announce one (RFC 9110)
+        bodyless = code in (204, 304)
+        if not bodyless:
+            self.send_header("Content-Length", str(len(data)))
         self.end_headers()
-        self.wfile.write(body.encode("utf-8"))
+        if not bodyless:
+            self.wfile.write(data)
+        self.server.metrics.observe_request(
+            urlparse(self.path).path, code, 0 if bodyless else len(data), time.perf_counter() - self._started
+        )
+
+    def _send_plan(self, raw: str, session_id: str):
+        """Plan as JSON (see `export.iter_plan_json`), cached and revalidated like the report."""
+        key = "j:" + render_key(raw)
+        etag = f'W/"{self.server.instance_id}-{key}"'
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            return self._send(304, b"", headers={"ETag": etag})
+        try:
+            body = self.server.render_cache.get(key)
+            if body is None:
+                body = self.server.render_pool.render(session_id, raw, kind="json").encode("utf-8")
+                self.server.render_cache.put(key, body)
+        except ServerBusy:
+            return self._send(503, json.dumps({"error": "Server ausgelastet"}), "application/json; charset=utf-8", {"Retry-After": "1"})
+        except Exception as e:
+            return self._send(400, json.dumps({"error": str(e)}, ensure_ascii=False), "application/json; charset=utf-8")
+        return self._send(200, body, "application/json; charset=utf-8", {"ETag": etag}, cache_key=key)
 
     def do_GET(self):
+        self._started = time.perf_counter()
         if self.path == "/":
             # try to preload config/config.yml
             preload = ""
             try:
-                cfg_path = os.path.join("config", "config.yml")
-                if os.path.exists(cfg_path):
-                    with open(cfg_path, "r", encoding="utf-8") as f:
+                if os.path.exists(CONFIG_PATH):
+                    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
                         preload = f.read()
             except Exception:
                 preload = ""
             page = INDEX_HTML.replace("{YAML}", preload)
             return self._send(200, page)
+        parsed = urlparse(self.path)
+        if parsed.path == "/api/plan":
+            # Plan of config/config.yml; one shared session keeps file edits incremental
+            try:
+                with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                    raw = f.read()
+            except OSError:
+                return self._send(404, json.dumps({"error": f"Config nicht gefunden: {CONFIG_PATH}"}), "application/json; charset=utf-8")
+            return self._send_plan(raw, "api:" + CONFIG_PATH)
+        if parsed.path == "/metrics":
+            return self._send(200, self.server.metrics.registry.expose(), "text/plain; version=0.0.4; charset=utf-8")
+        if parsed.path == "/events":
+            session_id = (parse_qs(parsed.query).get("session") or [""])[0]
+            if not session_id:
+                return self._send(400, "session fehlt", "text/plain; charset=utf-8")
+            # Counted at connect; the stream itself stays open
+            self.server.metrics.requests.inc("/events", "200")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            def write(data: bytes) -> None:
+                self.wfile.write(data)
+                self.wfile.flush()
+
+            try:
+                self.server.event_hub.stream(session_id, write)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return None
         return self._send(404, "Not found", "text/plain; charset=utf-8")
 
     def do_POST(self):
+        self._started = time.perf_counter()
         parsed = urlparse(self.path)
+        if parsed.path == "/api/plan":
+            length = int(self.headers.get("Content-Length", "0"))
+            raw = self.rfile.read(length).decode("utf-8") if length > 0 else ""
+            return self._send_plan(raw, self.headers.get("X-Forecast-Session", ""))
         if parsed.path == "/render":
             try:
                 length = int(self.headers.get("Content-Length", "0"))
                 raw = self.rfile.read(length).decode("utf-8") if length > 0 else ""
-                data = yaml.safe_load(raw) or {}
-                cfg = _config_from_dict(data)
-                html = create_html_report(cfg)
-                return self._send(200, html)
+                key = render_key(raw)
+                # Weak: the same report in any content encoding
+                etag = f'W/"{self.server.instance_id}-{key}"'
+                session_id = self.headers.get("X-Forecast-Session", "")
+                revision = int(self.headers.get("X-Forecast-Revision", "0") or 0)
+                # Also on 304 and cache hits, so an older render still running is dropped
+                self.server.render_pool.register(session_id, revision)
+                if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                    return self._send(304, b"", headers={"ETag": etag})
+                cache = self.server.render_cache
+                hub = self.server.event_hub
+                if self.headers.get("X-Forecast-Push") == "1" and session_id and hub.connected(session_id):
+                    # Push mode: sections go out over the session's event stream
+                    body = cache.get("s:" + key)
+                    if body is None:
+                        sections = self.server.render_pool.render(session_id, raw, revision, kind="sections")
+                        body = json.dumps(sections, ensure_ascii=False).encode("utf-8")
+                        cache.put("s:" + key, body)
+                    else:
+                        sections = [tuple(x) for x in json.loads(body)]
+                    if session_id and revision and self.server.render_pool.is_stale(session_id, revision):
+                        raise Superseded()
+                    if hub.publish(session_id, sections, revision):
+                        return self._send(202, b"", headers={"ETag": etag})
+                body = cache.get(key)
+                if body is None:
+                    html = self.server.render_pool.render(session_id, raw, revision)
+                    body = html.encode("utf-8")
+                    cache.put(key, body)
+                return self._send(200, body, headers={"ETag": etag}, cache_key=key)
+            except Superseded:
+                return self._send(204, b"")
+            except ServerBusy:
+                return self._send(503, "Server ausgelastet, bitte erneut versuchen", "text/plain; charset=utf-8", {"Retry-After": "1"})
             except Exception as e:
                 return self._send(400, f"Fehler beim Rendern: {e}", "text/plain; charset=utf-8")
         return self._send(404, "Not found", "text/plain; charset=utf-8")
 
 
-def serve(host: str = "127.0.0.1", port: int = 8765):
-    httpd = HTTPServer((host, port), Handler)
-    print(f"Live-Server läuft auf http://{host}:{port} — STRG+C zum Beenden")
-    httpd.serve_forever()
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = 2, queue_limit: int = 8, cache_mb: float = 64, watch: bool = True,
+          compress_level: Optional[int] = None):
+    if compress_level is None:
+        # Parsed once at startup: an invalid FORECAST_COMPRESS_LEVEL fails here, not per response
+        compress_level = env_level()
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    httpd.compress_level = compress_level
+    httpd.metrics = ServerMetrics()
+    httpd.render_pool = RenderPool(workers, queue_limit, httpd.metrics.stage_seconds)
+    httpd.render_cache = RenderCache(int(cache_mb * 1024 * 1024), httpd.metrics.cache_lookups)
+    httpd.metrics.cache = httpd.render_cache
+    httpd.event_hub = EventHub()
+    # ETags are only valid for this server process (code or data may change on restart)
+    httpd.instance_id = os.urandom(4).hex()
+    print(f"Live-Server läuft auf http://{host}:{port} ({workers} Render-Worker) — STRG+C zum Beenden")
+    watcher = None
+    if watch and os.path.isdir(os.path.dirname(CONFIG_PATH)):
+        from .watch import FileWatcher
+        # Saved edits from other editors go to every open browser, which re-renders them
+        watcher = FileWatcher(CONFIG_PATH, httpd.event_hub.broadcast_file).start()
+        print(f"Beobachte {CONFIG_PATH} ({watcher.mode})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        httpd.render_pool.shutdown()
+        httpd.server_close()
 
 
 def main(argv: list[str] | None = None) -> int:
     host = os.environ.get("FORECAST_HOST", "127.0.0.1")
     port = int(os.environ.get("FORECAST_PORT", "8765"))
-    serve(host, port)
+    workers = int(os.environ.get("FORECAST_WORKERS", str(min(4, os.cpu_count() or 1))))
+    queue_limit = int(os.environ.get("FORECAST_QUEUE", str(max(4, 2 * workers))))
+    cache_mb = float(os.environ.get("FORECAST_CACHE_MB", "64"))
+    watch = os.environ.get("FORECAST_WATCH", "1") != "0"
+    serve(host, port, workers, queue_limit, cache_mb, watch)
     return 0
 
 
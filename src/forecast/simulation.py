@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency at runtime
+    np = None  # type: ignore
+
+from .config import Config
+from .calendar import WorkCalendar
+from .capacity import compute_capacity_arrays
+from .team import assignment_key, calendar_key, capacity_key, member_projects_by_month, member_weights, team_members
+from .weights import assign_capacity_by_project_month
+
+# Runs per sampled batch; also the unit of work for the process pool
+BATCH_RUNS = 250
+
+
+@dataclass
+class ProjectSimulation:
+    name: str
+    used_p10: float
+    used_p50: float
+    used_p90: float
+    remaining_p10: float
+    remaining_p50: float
+    remaining_p90: float
+    share_ok: float
+    share_warn: float
+    share_error: float
+    share_exhausted: float
+    # Month by which the budget is exhausted in 50% / 90% of the runs (None = not reached)
+    exhausted_by_p50: Optional[str]
+    exhausted_by_p90: Optional[str]
+
+
+@dataclass
+class SimulationResult:
+    runs: int
+    seed: int
+    projects: List[ProjectSimulation]
+
+
+def _member_groups(cfg: Config, plan) -> List[tuple]:
+    """
+    Per group of identical members: (day→month one-hot, base hours per day,
+    sick probability, member count, project×month share of capacity).
+    Sickness is independent per person, so a group samples the number of
+    healthy members per day from a binomial distribution.
+    """
+    names = [r.name for r in plan.results]
+    months = plan.months
+    month_pos = {mk: i for i, mk in enumerate(months)}
+    explicit_weights = {p["name"]: dict(p["weights_by_month"]) for p in plan.projects}
+    unit = {mk: 1.0 for mk in months}
+
+    calendars: Dict[tuple, WorkCalendar] = {}
+    groups: Dict[tuple, list] = {}
+    for m in team_members(cfg):
+        state = m.state or cfg.settings.state
+        ckey = calendar_key(state, m.calendar)
+        if ckey not in calendars:
+            calendars[ckey] = WorkCalendar.build(
+                plan.planning_period,
+                state,
+                m.calendar.holiday_overrides_add,
+                m.calendar.holiday_overrides_remove,
+                m.calendar.vacations,
+            )
+        gkey = assignment_key(capacity_key(ckey, m.capacity, m.sickness), m)
+        if gkey in groups:
+            groups[gkey][3] += 1
+            continue
+        workdays = calendars[ckey].workdays
+        days, hours = compute_capacity_arrays(
+            workdays,
+            m.capacity.per_weekday,
+            [(o.start, o.end, o.hours_per_day) for o in m.capacity.interval_overrides],
+            0.0,
+        )
+        onehot = np.zeros((len(days), len(months)))
+        for i, mk in enumerate(str(x) for x in days.astype("datetime64[M]")):
+            j = month_pos.get(mk)
+            if j is not None:
+                onehot[i, j] = 1.0
+        share = np.zeros((len(names), len(months)))
+        shares = assign_capacity_by_project_month(
+            unit, member_projects_by_month(m, plan.projects_by_month), member_weights(m, explicit_weights)
+        )
+        for pi, name in enumerate(names):
+            share[pi, :] = shares.row(name, months)
+        groups[gkey] = [onehot, hours, m.sickness.prob_per_workday, 1, share]
+    return [tuple(g) for g in groups.values()]
+
+
+def _simulate_batch(groups, limits, rest, last_active, runs: int, seed_seq) -> Tuple:
+    """
+    Simulate one batch of runs; returns per run and project: used, remaining,
+    status, exhaustion month. Assigned hours are built one month at a time in
+    preallocated runs × projects buffers, so memory does not grow with
+    projects × months.
+    """
+    rng = np.random.default_rng(seed_seq)
+    n_projects, n_months = limits.shape
+    cap_months = []
+    for onehot, hours, p, n, share in groups:
+        if p > 0:
+            healthy = rng.binomial(n, 1.0 - p, size=(runs, len(hours)))
+        else:
+            healthy = np.full((runs, len(hours)), n)
+        cap_months.append((healthy * hours) @ onehot)  # runs × months
+
+    # Sequential budget burn, identical to compute_budget_ledgers
+    remaining = np.broadcast_to(rest, (runs, n_projects)).copy()
+    used_total = np.zeros((runs, n_projects))
+    zero_month = np.full((runs, n_projects), -1)
+    assigned = np.empty((runs, n_projects))
+    part = np.empty((runs, n_projects))
+    for j in range(n_months):
+        assigned.fill(0.0)
+        for cap_month, group in zip(cap_months, groups):
+            np.multiply(cap_month[:, j, None], group[4][None, :, j], out=part)
+            np.add(assigned, part, out=assigned)
+        use = np.minimum(np.minimum(assigned, limits[:, j]), remaining)
+        use = np.maximum(use, 0.0)
+        used_total += use
+        remaining = np.maximum(0.0, remaining - use)
+        newly = (zero_month < 0) & (remaining == 0.0) & (use > 0)
+        zero_month[newly] = j
+
+    # Status as in the budget table: 0 = ok, 1 = warn, 2 = error
+    warn = remaining > 1e-9
+    ok = ~warn & (zero_month == last_active) & (np.abs(used_total - rest) <= 1e-6)
+    status = np.where(warn, 1, np.where(ok, 0, 2))
+    return used_total, remaining, status, zero_month
+
+
+def simulate_plan(cfg: Config, plan, runs: int, seed: int = 42, workers: int = 1) -> SimulationResult:
+    """
+    Monte Carlo simulation of sickness: each person is sick on a workday with
+    probability prob_per_workday (capacity 0 that day). Runs are sampled in
+    batches of BATCH_RUNS with independent child seeds, so results depend only
+    on `seed` and `runs`, not on `workers`.
+    """
+    if np is None:
+        raise ValueError("Simulation benötigt NumPy (pip install -e .[fast])")
+    names = [r.name for r in plan.results]
+    months = plan.months
+    if runs <= 0 or not names or not months:
+        return SimulationResult(runs=runs, seed=seed, projects=[])
+
+    groups = _member_groups(cfg, plan)
+    ledgers = [plan.ledgers[name] for name in names]
+    limits = np.array([lg.limit for lg in ledgers], dtype=float)
+    rest = np.array([lg.budget for lg in ledgers])
+    month_pos = {mk: j for j, mk in enumerate(months)}
+    last_active = np.array([month_pos[lg.last_active_month] if lg.last_active_month else -2 for lg in ledgers])
+
+    sizes = [min(BATCH_RUNS, runs - i) for i in range(0, runs, BATCH_RUNS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(groups, limits, rest, last_active, n, ss) for n, ss in zip(sizes, seeds)]
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            parts = list(ex.map(_simulate_batch, *zip(*args)))
+    else:
+        parts = [_simulate_batch(*a) for a in args]
+
+    used = np.concatenate([x[0] for x in parts])
+    remaining = np.concatenate([x[1] for x in parts])
+    status = np.concatenate([x[2] for x in parts])
+    zero_month = np.concatenate([x[3] for x in parts])
+
+    used_q = np.percentile(used, [10, 50, 90], axis=0)
+    rem_q = np.percentile(remaining, [10, 50, 90], axis=0)
+    # Never exhausted counts as "after the last month"
+    exhaust = np.where(zero_month < 0, len(months), zero_month)
+    exhaust_q = np.percentile(exhaust, [50, 90], axis=0, method="higher")
+
+    def month_or_none(j) -> Optional[str]:
+        return months[int(j)] if int(j) < len(months) else None
+
+    projects: List[ProjectSimulation] = []
+    for pi, name in enumerate(names):
+        projects.append(
+            ProjectSimulation(
+                name=name,
+                used_p10=float(used_q[0, pi]),
+                used_p50=float(used_q[1, pi]),
+                used_p90=float(used_q[2, pi]),
+                remaining_p10=float(rem_q[0, pi]),
+                remaining_p50=float(rem_q[1, pi]),
+                remaining_p90=float(rem_q[2, pi]),
+                share_ok=float(np.mean(status[:, pi] == 0)),
+                share_warn=float(np.mean(status[:, pi] == 1)),
+                share_error=float(np.mean(status[:, pi] == 2)),
+                share_exhausted=float(np.mean(zero_month[:, pi] >= 0)),
+                exhausted_by_p50=month_or_none(exhaust_q[0, pi]),
+                exhausted_by_p90=month_or_none(exhaust_q[1, pi]),
+            )
+        )
+    return SimulationResult(runs=runs, seed=seed, projects=projects)
@@ -0,0 +1,50 @@
+"""
+Team members and the keys that group members with identical settings;
+shared by the plan build (`engine`) and the sickness simulation.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from .config import CalendarConfig, CapacityConfig, Config, SicknessConfig, TeamMember
+
+
+def team_members(cfg: Config) -> List[TeamMember]:
+    if cfg.team:
+        return cfg.team
+    # Single-person mode: one implicit member with the top-level sections
+    return [TeamMember(name="", capacity=cfg.capacity, calendar=cfg.calendar, sickness=cfg.sickness)]
+
+
+def member_projects_by_month(m: TeamMember, projects_by_month: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    if m.projects is None:
+        return projects_by_month
+    allowed = set(m.projects)
+    return {mk: [p for p in names if p in allowed] for mk, names in projects_by_month.items()}
+
+
+def member_weights(m: TeamMember, explicit_weights: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    return {**explicit_weights, **{p: w for p, w in m.weights_by_month.items() if p in explicit_weights}}
+
+
+def calendar_key(state: str, cal: CalendarConfig) -> tuple:
+    return (state.upper(), tuple(cal.vacations), tuple(sorted(cal.holiday_overrides_add)), tuple(sorted(cal.holiday_overrides_remove)))
+
+
+def capacity_key(cal_key: tuple, capacity: CapacityConfig, sickness: SicknessConfig) -> tuple:
+    return (
+        cal_key,
+        tuple(sorted(capacity.per_weekday.items())),
+        tuple((o.start, o.end, o.hours_per_day) for o in capacity.interval_overrides),
+        sickness.prob_per_workday,
+    )
+
+
+def assignment_key(cap_key: tuple, m: TeamMember) -> tuple:
+    """Members with equal key get the same project×month assignment."""
+    return (
+        cap_key,
+        tuple(m.projects) if m.projects is not None else None,
+        tuple(sorted((p, tuple(sorted(w.items()))) for p, w in m.weights_by_month.items())),
+    )
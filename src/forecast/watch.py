@@ -0,0 +1,156 @@
+"""
+Watch a config file for edits: inotify on Linux (via libc, no extra
+dependency), mtime polling elsewhere. Bursts of events (editors often
+write, rename and touch in one save) are coalesced, and the callback only
+runs when the file content hash changed.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Optional
+
+# inotify event mask: everything that can replace the file's content
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _inotify_fd(directory: str) -> Optional[int]:
+    """Non-blocking inotify descriptor watching `directory`; None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        # The directory, not the file: editors save by renaming a new file over it
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_MASK) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except Exception:
+        return None
+
+
+class FileWatcher:
+    """
+    Calls `on_change(text)` after `path` was saved with new content. Events
+    are collected until the file has been quiet for `debounce` seconds.
+    Use `start()` for a background thread or `run()` to block.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[str], None], debounce: float = 0.2, interval: float = 0.5):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.interval = interval
+        self._name = os.fsencode(os.path.basename(self.path))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._fd = _inotify_fd(os.path.dirname(self.path))
+        self.mode = "inotify" if self._fd is not None else "polling"
+        self._stat = self._stat_key()
+        self._hash = self._read()[1]
+
+    def _stat_key(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            return None
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None, None
+        return data, hashlib.sha256(data).hexdigest()
+
+    def _wait(self, timeout: float) -> bool:
+        """True if the file may have changed within `timeout` seconds."""
+        if self._fd is None:
+            if self._stop.wait(timeout):
+                return False
+            key = self._stat_key()
+            if key == self._stat:
+                return False
+            self._stat = key
+            return True
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        hit = False
+        try:
+            while True:
+                buf = os.read(self._fd, 65536)
+                pos = 0
+                while pos < len(buf):
+                    _, _, _, length = _EVENT_HEADER.unpack_from(buf, pos)
+                    pos += _EVENT_HEADER.size
+                    if buf[pos:pos + length].rstrip(b"\0") == self._name:
+                        hit = True
+                    pos += length
+        except BlockingIOError:
+            pass
+        return hit
+
+    def check(self) -> bool:
+        """Run the callback if the content hash changed; True if it ran."""
+        data, digest = self._read()
+        if data is None or digest == self._hash:
+            return False
+        self._hash = digest
+        try:
+            self.on_change(data.decode("utf-8"))
+        except Exception as e:
+            print(f"Fehler: {e}", file=sys.stderr)
+        return True
+
+    def run(self) -> None:
+        self._running = True
+        try:
+            while not self._stop.is_set():
+                if not self._wait(self.interval):
+                    continue
+                # Coalesce: wait until the burst of events is over
+                while not self._stop.is_set() and self._wait(self.debounce):
+                    pass
+                self.check()
+        finally:
+            self._running = False
+            if self._stop.is_set():
+                self._close()
+
+    def start(self) -> "FileWatcher":
+        self._thread = threading.Thread(target=self.run, name="forecast-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * max(self.interval, self.debounce))
+        # Still inside run() (e.g. a long on_change): run() closes the fd when it ends
+        if not self._running:
+            self._close()
+
+    def _close(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
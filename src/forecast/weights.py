@@ -1,45 +1,123 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 
-def compute_month_weights(
+_NO_WEIGHTS: Dict[str, float] = {}
+
+
+def month_weights(
     active_projects: List[str],
     explicit_weights: Dict[str, Dict[str, float]],
     month: str,
-) -> Dict[str, float]:
+) -> List[float]:
     """
-    Returns weights per project for the given month.
+    Weights (percent) of `active_projects` for the given month, in that order.
     - If sum of explicit weights for the month is 0 (i.e., no weights provided), distribute equally among active_projects.
     - If some explicit weights exist: use them, projects without entry get 0. Validate sum <= 100.
     """
-    weights_this_month = {p: float(explicit_weights.get(p, {}).get(month, 0.0)) for p in active_projects}
-    total = sum(weights_this_month.values())
+    ws = [float(explicit_weights.get(p, _NO_WEIGHTS).get(month, 0.0)) for p in active_projects]
+    total = sum(ws)
     if total == 0:
         if not active_projects:
-            return {}
-        eq = 100.0 / len(active_projects)
-        return {p: eq for p in active_projects}
+            return []
+        return [100.0 / len(active_projects)] * len(active_projects)
     if total > 100.0 + 1e-9:
         raise ValueError(f"Summe der Gewichte für {month} überschreitet 100%: {total}")
-    return weights_this_month
+    return ws
+
+
+class AssignmentMatrix(Mapping):
+    """
+    Assigned capacity as a dense project×month matrix with integer indices.
+    Also a read-only mapping (project, month) -> hours over the assigned
+    cells, so `.get((p, m), 0.0)` keeps working for existing consumers.
+    """
+
+    def __init__(self, projects: List[str], months: List[str]):
+        self.projects = projects
+        self.months = months
+        self.project_index = {p: i for i, p in enumerate(projects)}
+        self.month_index = {m: j for j, m in enumerate(months)}
+        self.values: List[List[float]] = [[0.0] * len(months) for _ in projects]
+        # Assigned cells in assignment order (month-major), i.e. the mapping keys
+        self._cells: List[Tuple[int, int]] = []
+        self._assigned = [[False] * len(months) for _ in projects]
+
+    def _set(self, i: int, j: int, hours: float) -> None:
+        if not self._assigned[i][j]:
+            self._assigned[i][j] = True
+            self._cells.append((i, j))
+        self.values[i][j] = hours
+
+    def __getitem__(self, key: Tuple[str, str]) -> float:
+        p, m = key
+        i = self.project_index.get(p)
+        j = self.month_index.get(m)
+        if i is None or j is None or not self._assigned[i][j]:
+            raise KeyError(key)
+        return self.values[i][j]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for i, j in self._cells:
+            yield (self.projects[i], self.months[j])
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def row(self, project: str, months: List[str]) -> List[float]:
+        """Assigned hours of `project` for the given month keys (0.0 where unassigned)."""
+        i = self.project_index.get(project)
+        if i is None:
+            return [0.0] * len(months)
+        vals = self.values[i]
+        idx = self.month_index
+        return [vals[idx[m]] if m in idx else 0.0 for m in months]
+
+    def add(self, other: "AssignmentMatrix", factor: float = 1.0) -> None:
+        """Add `factor` × the assigned cells of `other` (e.g. one team member)."""
+        pidx = [self.project_index[p] for p in other.projects]
+        midx = [self.month_index[m] for m in other.months]
+        for i, j in other._cells:
+            si, sj = pidx[i], midx[j]
+            self._set(si, sj, self.values[si][sj] + other.values[i][j] * factor)
+
+    def total(self, project: str) -> float:
+        i = self.project_index.get(project)
+        return sum(self.values[i]) if i is not None else 0.0
 
 
 def assign_capacity_by_project_month(
     capacity_by_month: Dict[str, float],
     projects_by_month: Dict[str, List[str]],
     explicit_weights: Dict[str, Dict[str, float]],
-) -> Dict[Tuple[str, str], float]:
+    previous: Optional[AssignmentMatrix] = None,
+    dirty_months: Optional[Set[str]] = None,
+) -> AssignmentMatrix:
     """
-    Returns mapping of (project, month) -> assigned capacity hours.
+    Returns the assigned capacity hours per (project, month), built in one
+    pass over the months. Weight rules as in `month_weights`.
+    With `previous`, months outside `dirty_months` are copied from it (their
+    capacity, active projects and weights must be unchanged).
     """
-    res: Dict[Tuple[str, str], float] = {}
-    for month, cap in capacity_by_month.items():
+    projects: Dict[str, None] = {}
+    for names in projects_by_month.values():
+        for p in names:
+            projects.setdefault(p, None)
+    months = list(capacity_by_month)
+    res = AssignmentMatrix(list(projects), months)
+    pidx = res.project_index
+    for j, month in enumerate(months):
+        cap = capacity_by_month[month]
         actives = projects_by_month.get(month, [])
         if not actives or cap <= 0:
             continue
-        w = compute_month_weights(actives, explicit_weights, month)
-        for p in actives:
-            res[(p, month)] = cap * (w.get(p, 0.0) / 100.0)
+        if previous is not None and month not in dirty_months:
+            pj = previous.month_index[month]
+            for p in actives:
+                res._set(pidx[p], j, previous.values[previous.project_index[p]][pj])
+            continue
+        for p, w in zip(actives, month_weights(actives, explicit_weights, month)):
+            res._set(pidx[p], j, cap * (w / 100.0))
     return res
-